@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from google.adk.agents import Agent
+from google.adk.models import Gemini
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.adk.tools import FunctionTool, AgentTool
@@ -20,7 +21,8 @@ from google.adk.tools.google_search_agent_tool import create_google_search_agent
 from google.genai import types
 import asyncio
 from dotenv import load_dotenv
-from band_tour_agent.tools import get_current_datetime
+from band_tour_agent.tools import get_current_datetime, similar_artists
+from maestro_common.tool_budget import record_tool_usage
 
 load_dotenv()
 
@@ -28,13 +30,15 @@ APP_NAME = "band_tour_agent"
 USER_ID = "user1234"
 SESSION_ID = "1234"
 
+MODEL = Gemini(model="gemini-2.5-flash")
+
 # Create a specialized agent for searching
-search_agent = create_google_search_agent(model="gemini-2.5-flash")
+search_agent = create_google_search_agent(model=MODEL)
 search_tool = AgentTool(agent=search_agent)
 
 root_agent = Agent(
     name="band_tour_agent",
-    model="gemini-2.5-flash",
+    model=MODEL,
     description="Agent to find concerts for bands similar to user preferences near a specific zip code.",
     instruction="""
     You are a helpful assistant that helps users find concerts.
@@ -43,7 +47,7 @@ root_agent = Agent(
     1.  Identify the user's musical preferences (specific bands or musical styles).
     2.  Identify the user's location (zip code).
     3.  If any of this information is missing, ask the user for it.
-    4.  Once you have the preferences, generate a list of 3-5 similar bands or artists if the user provided specific bands. If the user provided a style, identify 3-5 popular touring bands in that style.
+    4.  Once you have the preferences, use the 'similar_artists' tool to get 3-5 similar bands or artists for each band the user provided, and use its results as given. Only if the tool finds no match, suggest similar bands yourself. If the user provided a style, identify 3-5 popular touring bands in that style.
     5.  Time Awareness: Use the 'get_current_datetime' tool to get the current date. This is CRITICAL.
     6.  Use the 'google_search_agent' tool to find upcoming tour dates for these bands near the provided zip code. Search for "Band Name tour dates [Zip Code]" or "Band Name concerts near [Zip Code]".
     7.  Compare the dates found with the current date to ensure they are upcoming.
@@ -51,7 +55,8 @@ root_agent = Agent(
     
     Be concise and helpful.
     """,
-    tools=[FunctionTool(get_current_datetime), search_tool]
+    tools=[FunctionTool(get_current_datetime), FunctionTool(similar_artists), search_tool],
+    after_tool_callback=record_tool_usage,
 )
 
 # Session and Runner
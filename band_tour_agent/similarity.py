@@ -0,0 +1,161 @@
+"""Precomputed artist-similarity index for the band tour agent.
+
+The index is built once from an edge list (`artist,similar_artist,score`
+CSV) into a few NumPy arrays that are memory-mapped at load time, so loading
+costs the same for ten artists or ten million and lookups never touch the
+model. Rows are sorted by a stable 64-bit hash of the normalized artist name,
+which makes a lookup a single `searchsorted`:
+
+    hashes.npy        uint64 (N,)     sorted name hashes
+    name_offsets.npy  int64  (N + 1,) offsets of each display name in names.npy
+    names.npy         uint8           UTF-8 display names, concatenated
+    neighbors.npy     int32  (N, K)   rows of the K most similar artists (-1 = none)
+    scores.npy        float32 (N, K)  similarity of each neighbor
+
+New builds are swapped in atomically as a whole (see maestro_common/mmap_index.py).
+
+Results are deterministic for a given dataset, so downstream tour searches
+for the same artists can be cached.
+
+Build or rebuild the index with:
+    python -m band_tour_agent.similarity build [edges.csv] [index_dir]
+"""
+
+import csv
+import os
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from maestro_common.mmap_index import LazyIndex, build_cli, load_index, save_index
+from maestro_common.names import name_hash, normalize_name
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+EDGES_FILE = os.getenv("MAESTRO_ARTIST_EDGES", os.path.join(DATA_DIR, "similar_artists.csv"))
+INDEX_DIR = os.getenv("MAESTRO_ARTIST_INDEX_DIR", os.path.join(DATA_DIR, "similar_artists_index"))
+MAX_NEIGHBORS = 10
+
+_INDEX_FILES = ["hashes", "name_offsets", "names", "neighbors", "scores"]
+
+
+def write_index(names: List[str], neighbors: np.ndarray, scores: np.ndarray, index_dir: str = INDEX_DIR) -> None:
+    """Writes an index from artist names and their neighbor rows.
+
+    Args:
+        names: Display names; row i of `neighbors` / `scores` belongs to names[i].
+        neighbors: int32 array (N, K) of row numbers into `names`, -1 for padding.
+        scores: float32 array (N, K) of similarity scores.
+        index_dir: Where to write the index.
+    """
+    hashes = np.fromiter((name_hash(normalize_name(n)) for n in names), dtype=np.uint64, count=len(names))
+    order = np.argsort(hashes, kind="stable")
+    position = np.empty_like(order)
+    position[order] = np.arange(len(order))
+
+    neighbors = neighbors[order]
+    neighbors = np.where(neighbors >= 0, position[np.maximum(neighbors, 0)], -1).astype(np.int32)
+
+    encoded = [names[i].encode("utf-8") for i in order]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    arrays = {
+        "hashes": hashes[order],
+        "name_offsets": offsets,
+        "names": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "neighbors": neighbors,
+        "scores": scores[order].astype(np.float32),
+    }
+
+    save_index(arrays, index_dir)
+
+
+def build_index(edges_file: str = EDGES_FILE, index_dir: str = INDEX_DIR, k: int = MAX_NEIGHBORS) -> int:
+    """Builds the index from a CSV edge list with columns artist, similar_artist, score.
+
+    Edges are treated as symmetric. Each artist keeps its `k` highest-scoring
+    neighbors, ties broken by name so the result is stable.
+
+    Returns:
+        The number of artists in the index.
+    """
+    display: Dict[str, str] = {}
+    edges: Dict[str, Dict[str, float]] = defaultdict(dict)
+    with open(edges_file, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            a, b = row["artist"].strip(), row["similar_artist"].strip()
+            key_a, key_b = normalize_name(a), normalize_name(b)
+            if not key_a or not key_b or key_a == key_b:
+                continue
+            score = float(row.get("score") or 1.0)
+            display.setdefault(key_a, a)
+            display.setdefault(key_b, b)
+            edges[key_a][key_b] = max(score, edges[key_a].get(key_b, 0.0))
+            edges[key_b][key_a] = max(score, edges[key_b].get(key_a, 0.0))
+
+    keys = sorted(display)
+    row_of = {key: i for i, key in enumerate(keys)}
+    neighbors = np.full((len(keys), k), -1, dtype=np.int32)
+    scores = np.zeros((len(keys), k), dtype=np.float32)
+    for key, similar in edges.items():
+        ranked = sorted(similar.items(), key=lambda item: (-item[1], item[0]))[:k]
+        for j, (other, score) in enumerate(ranked):
+            neighbors[row_of[key], j] = row_of[other]
+            scores[row_of[key], j] = score
+
+    write_index([display[key] for key in keys], neighbors, scores, index_dir)
+    return len(keys)
+
+
+class ArtistIndex:
+    """Memory-mapped artist-similarity index."""
+
+    def __init__(self, index_dir: str = INDEX_DIR):
+        arrays = load_index(index_dir, _INDEX_FILES)
+        self.hashes = arrays["hashes"]
+        self.name_offsets = arrays["name_offsets"]
+        self.names = arrays["names"]
+        self.neighbors = arrays["neighbors"]
+        self.scores = arrays["scores"]
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def name_at(self, row: int) -> str:
+        start, end = self.name_offsets[row], self.name_offsets[row + 1]
+        return self.names[start:end].tobytes().decode("utf-8")
+
+    def find(self, name: str) -> Optional[int]:
+        """Returns the row of an artist, or None if it is not in the index."""
+        key = normalize_name(name)
+        target = np.uint64(name_hash(key))
+        row = int(np.searchsorted(self.hashes, target))
+        while row < len(self.hashes) and self.hashes[row] == target:
+            if normalize_name(self.name_at(row)) == key:
+                return row
+            row += 1
+        return None
+
+    def similar(self, name: str, k: int = 5) -> Optional[List[Dict[str, float]]]:
+        """Returns up to `k` similar artists with scores, or None if the artist is unknown."""
+        row = self.find(name)
+        if row is None:
+            return None
+        result = []
+        for other, score in zip(self.neighbors[row, :k], self.scores[row, :k]):
+            if other < 0:
+                break
+            result.append({"name": self.name_at(int(other)), "score": round(float(score), 3)})
+        return result
+
+
+_index = LazyIndex(ArtistIndex, build_index, _INDEX_FILES, EDGES_FILE, INDEX_DIR)
+
+
+def get_index() -> ArtistIndex:
+    """Returns the shared index, building it from the edge list first if it is missing or stale."""
+    return _index.get()
+
+
+if __name__ == "__main__":
+    build_cli(__doc__, build_index, EDGES_FILE, INDEX_DIR, "artists")
@@ -1,4 +1,7 @@
 from datetime import datetime
+from typing import Any, Dict
+
+from band_tour_agent.similarity import MAX_NEIGHBORS, get_index
 
 def get_current_datetime() -> str:
     """Returns the current date and time.
@@ -10,3 +13,23 @@ def get_current_datetime() -> str:
     # For better consistency, let's use UTC or EST as a default, or try to detect
     # But for a simple tool, returning local system time is usually expected unless specified
     return datetime.now().astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
+
+def similar_artists(name: str, k: int = 5) -> Dict[str, Any]:
+    """Looks up artists similar to a given artist or band in the local similarity index.
+
+    Args:
+        name: The artist or band name (e.g. "Radiohead").
+        k: How many similar artists to return (at most 10).
+
+    Returns:
+        A dictionary with the matched 'artist' and the 'similar' artists, most similar first.
+        'similar' is empty if the artist is not in the index.
+    """
+    k = min(max(k, 1), MAX_NEIGHBORS)
+    try:
+        similar = get_index().similar(name, k)
+    except Exception as e:
+        return {"artist": name, "similar": [], "error": f"Similarity index unavailable: {e}"}
+    if similar is None:
+        return {"artist": name, "similar": [], "note": "Artist not found in the local similarity index."}
+    return {"artist": name, "similar": [s["name"] for s in similar]}
@@ -0,0 +1,180 @@
+"""Batch / offline query processing through the orchestrator.
+
+Reads queries from a JSONL file, runs them through the orchestrator with
+bounded concurrency and an optional request-rate cap, and appends one JSONL
+result per query with its timing. The output file doubles as the checkpoint:
+re-running the same command skips every query that already has a successful
+result, so an interrupted nightly job resumes where it stopped.
+
+A result is "ok" only if the orchestrator answered without help from the
+fallbacks. Answers built on a cached or error fallback (an upstream was
+failing) are recorded as "degraded", and failures and empty responses as
+"error". Both are run again on resume.
+
+All items share one event loop, the same runners, model connections and tool
+caches, and the orchestrator's coalescing and fallback caches.
+
+Input lines look like:
+    {"id": "client-42", "query": "Analyze the portfolio at /data/client-42.csv"}
+`id` defaults to the line number and an optional `user_id` is passed through.
+
+Usage:
+    python batch.py queries.jsonl results.jsonl --concurrency 8 --rate 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from datetime import datetime, timezone
+
+from orchestrator_agent.agent import USER_ID, run_query
+from orchestrator_agent.resilience import DegradedAnswer
+from orchestrator_agent.warmup import warm_up
+
+
+def load_queries(path: str) -> list:
+    """Reads and validates the input JSONL file, assigning line numbers as ids where missing.
+
+    Raises:
+        ValueError: If a line is not a JSON object with a non-empty string "query".
+    """
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON ({e})") from e
+            if not isinstance(item, dict):
+                raise ValueError(f"{path}:{line_number}: expected a JSON object")
+            if not isinstance(item.get("query"), str) or not item["query"].strip():
+                raise ValueError(f"{path}:{line_number}: missing a non-empty string 'query'")
+            item["id"] = str(item.get("id", line_number))
+            items.append(item)
+    return items
+
+
+def load_completed(path: str) -> set:
+    """Returns the ids that already have a successful result in the output file."""
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # A partial line from an interrupted run.
+            if record.get("status") == "ok":
+                completed.add(str(record["id"]))
+    return completed
+
+
+class RateLimiter:
+    """Spaces out request starts to at most `rate` per second (0 disables)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_start = 0.0
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        start = max(now, self.next_start)
+        self.next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def run_batch(items: list, output_path: str, concurrency: int, rate: float) -> list:
+    """Runs `items` through the orchestrator and appends each result to `output_path`.
+
+    Returns:
+        The result records written during this run.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate)
+    results = []
+
+    with open(output_path, "a", encoding="utf-8") as out:
+
+        async def process(item):
+            async with semaphore:
+                await limiter.wait()
+                record = {
+                    "id": item["id"],
+                    "query": item["query"],
+                    "started_at": datetime.now(timezone.utc).isoformat(),
+                }
+                start = time.perf_counter()
+                try:
+                    response = await run_query(item["query"], user_id=item.get("user_id", USER_ID))
+                    record["response"] = str(response)
+                    if isinstance(response, DegradedAnswer):
+                        record["status"] = "degraded"
+                        record["error"] = response.reason
+                    else:
+                        record["status"] = "ok"
+                except Exception as e:
+                    record["status"] = "error"
+                    record["error"] = str(e)
+                record["duration_s"] = round(time.perf_counter() - start, 3)
+                # One line per item, flushed immediately, so the file is a valid checkpoint.
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                results.append(record)
+                print(f"[{len(results)}/{len(items)}] {record['id']}: {record['status']} in {record['duration_s']}s")
+
+        await asyncio.gather(*(process(item) for item in items))
+    return results
+
+
+async def main_async(args) -> None:
+    try:
+        items = load_queries(args.input)
+    except ValueError as e:
+        raise SystemExit(f"Invalid input: {e}")
+    completed = set() if args.no_resume else load_completed(args.output)
+    pending = [item for item in items if item["id"] not in completed]
+    print(f"{len(items)} queries, {len(items) - len(pending)} already done, {len(pending)} to run.")
+    if not pending:
+        return
+
+    timings = await warm_up()
+    if timings:
+        print(f"Warm-up: {timings}")
+
+    start = time.perf_counter()
+    results = await run_batch(pending, args.output, args.concurrency, args.rate)
+    elapsed = time.perf_counter() - start
+
+    durations = sorted(r["duration_s"] for r in results)
+    degraded = sum(1 for r in results if r["status"] == "degraded")
+    failed = sum(1 for r in results if r["status"] == "error")
+    p95 = durations[min(len(durations) - 1, int(0.95 * len(durations)))]
+    print(
+        f"Done: {len(results) - degraded - failed} ok, {degraded} degraded, {failed} failed in {elapsed:.1f}s "
+        f"({len(results) / elapsed:.2f} queries/s, p50 {statistics.median(durations):.2f}s, p95 {p95:.2f}s)."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL file of queries.")
+    parser.add_argument("output", help="JSONL file results are appended to (also the resume checkpoint).")
+    parser.add_argument("--concurrency", type=int, default=4, help="Queries in flight at once.")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="Max queries started per second, e.g. the upstream rate limit (0 = unlimited).")
+    parser.add_argument("--no-resume", action="store_true", help="Re-run queries that already succeeded.")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
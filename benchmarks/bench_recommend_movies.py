@@ -0,0 +1,101 @@
+"""Benchmarks the movie recommendation engine: build time, load time and ranking latency.
+
+Generates a synthetic catalog of `--movies` titles (random genres, cast and
+directors drawn from realistic vocabulary sizes), then measures how long it
+takes to memory-map the index and to rank the whole catalog for random
+preference profiles, plus the same for the bundled catalog.
+
+    python benchmarks/bench_recommend_movies.py --movies 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from movie_agent.recommender import MovieIndex, get_index, write_index  # noqa: E402
+
+GENRES = [
+    "Action", "Adventure", "Animation", "Biography", "Comedy", "Crime", "Documentary", "Drama", "Family",
+    "Fantasy", "History", "Horror", "Music", "Mystery", "Romance", "Sci-Fi", "Thriller", "War", "Western",
+]
+
+
+def _profile(actors: list, directors: list) -> dict:
+    return {
+        "genres": random.sample(GENRES, 3),
+        "actors": random.sample(actors, 5),
+        "directors": random.sample(directors, 2),
+        "exclude_titles": [f"Synthetic Movie {random.randrange(1000)}" for _ in range(50)],
+    }
+
+
+def _ranking_latencies(index: MovieIndex, actors: list, directors: list, runs: int, k: int) -> list:
+    latencies = []
+    for _ in range(runs):
+        profile = _profile(actors, directors)
+        start = time.perf_counter()
+        result = index.recommend(k=k, **profile)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert len(result) == min(k, len(index))
+    return latencies
+
+
+def _report(label: str, latencies: list) -> None:
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+    print(f"{label}: p50 {statistics.median(latencies):.2f} ms, p99 {p99:.2f} ms, max {latencies[-1]:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=1_000_000)
+    parser.add_argument("--actors", type=int, default=200_000, help="Distinct actors in the synthetic catalog.")
+    parser.add_argument("--directors", type=int, default=50_000, help="Distinct directors in the synthetic catalog.")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+    random.seed(0)
+
+    start = time.perf_counter()
+    index = get_index()
+    print(f"Bundled catalog: {len(index)} movies, loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+    bundled = {"genres": ["Sci-Fi", "Thriller"], "actors": ["Tom Hardy"], "directors": ["Christopher Nolan"]}
+    latencies = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        index.recommend(k=args.k, **bundled)
+        latencies.append((time.perf_counter() - start) * 1000)
+    _report("Bundled ranking", latencies)
+
+    actors = [f"Actor {i}" for i in range(args.actors)]
+    directors = [f"Director {i}" for i in range(args.directors)]
+    columns = {
+        "titles": [f"Synthetic Movie {i}" for i in range(args.movies)],
+        "years": [random.randint(1920, 2025) for _ in range(args.movies)],
+        "ratings": [round(random.uniform(1, 10), 1) for _ in range(args.movies)],
+        "genres": [random.sample(GENRES, random.randint(1, 3)) for _ in range(args.movies)],
+        "cast": [random.sample(actors, 4) for _ in range(args.movies)],
+        "directors": [random.choice(directors) for _ in range(args.movies)],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index_dir = os.path.join(tmp_dir, "index")
+        start = time.perf_counter()
+        write_index(index_dir=index_dir, **columns)
+        print(f"Synthetic catalog: built {args.movies} movies in {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        synthetic = MovieIndex(index_dir)
+        print(f"Synthetic catalog: loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+        _report("Synthetic ranking", _ranking_latencies(synthetic, actors, directors, args.runs, args.k))
+        del synthetic
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmarks the artist-similarity index: build time, load time and lookup latency.
+
+Generates a synthetic index of `--artists` artists with `--k` neighbors each,
+then measures how long it takes to memory-map it and to answer random
+`similar(name, k)` lookups, plus the same for the bundled dataset.
+
+    python benchmarks/bench_similar_artists.py --artists 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from band_tour_agent.similarity import ArtistIndex, get_index, write_index  # noqa: E402
+
+
+def _lookup_latencies(index: ArtistIndex, names: list, lookups: int, k: int) -> list:
+    latencies = []
+    for name in random.choices(names, k=lookups):
+        start = time.perf_counter()
+        result = index.similar(name, k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert result is not None, name
+    return latencies
+
+
+def _report(label: str, latencies: list) -> None:
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+    print(f"{label}: p50 {statistics.median(latencies):.3f} ms, p99 {p99:.3f} ms, max {latencies[-1]:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artists", type=int, default=1_000_000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+    random.seed(0)
+
+    start = time.perf_counter()
+    index = get_index()
+    print(f"Bundled index: {len(index)} artists, loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+    bundled_names = [index.name_at(row) for row in range(len(index)) if index.neighbors[row, 0] >= 0]
+    _report("Bundled lookups", _lookup_latencies(index, bundled_names, args.lookups, 5))
+
+    names = [f"Synthetic Artist {i}" for i in range(args.artists)]
+    rng = np.random.default_rng(0)
+    neighbors = rng.integers(0, args.artists, size=(args.artists, args.k), dtype=np.int32)
+    scores = np.sort(rng.random((args.artists, args.k), dtype=np.float32), axis=1)[:, ::-1]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index_dir = os.path.join(tmp_dir, "index")
+        start = time.perf_counter()
+        write_index(names, neighbors, scores, index_dir)
+        print(f"Synthetic index: built {args.artists} artists in {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        synthetic = ArtistIndex(index_dir)
+        print(f"Synthetic index: loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+        _report("Synthetic lookups", _lookup_latencies(synthetic, names, args.lookups, 5))
+        del synthetic
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmarks backend throughput against the number of uvicorn workers.
+
+For each worker count this starts `server.py`, waits for /readyz, then keeps
+`--concurrency` clients sending the same query to /run_sse for `--duration`
+seconds and reports requests/second and latency percentiles.
+
+The default query runs the finance agent's CPU-bound portfolio analysis, so a
+GOOGLE_API_KEY is required just as for the real backend.
+
+    python benchmarks/bench_workers.py --workers 1 2 4 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _write_sample_portfolio(rows: int) -> str:
+    sectors = ["Technology", "Healthcare", "Energy", "Financials", "Utilities", "Consumer"]
+    fd, path = tempfile.mkstemp(suffix=".csv", prefix="portfolio_")
+    with os.fdopen(fd, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Symbol", "Market Value", "Sector"])
+        for i in range(rows):
+            writer.writerow([f"SYM{i}", f"{random.uniform(100, 100000):.2f}", random.choice(sectors)])
+    return path
+
+
+async def _wait_ready(client: httpx.AsyncClient, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/readyz")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+    raise RuntimeError("Server did not become ready in time.")
+
+
+async def _run_load(base_url: str, app_name: str, query: str, concurrency: int, duration: float):
+    """Returns the successful request latencies and the wall-clock time of the load phase."""
+    latencies = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        await _wait_ready(client)
+
+        async def worker(index: int):
+            user_id = f"bench{index}"
+            stop_at = time.monotonic() + duration
+            while time.monotonic() < stop_at:
+                session = (await client.post(f"/apps/{app_name}/users/{user_id}/sessions")).json()
+                body = {
+                    "app_name": app_name,
+                    "user_id": user_id,
+                    "session_id": session["id"],
+                    "new_message": {"role": "user", "parts": [{"text": query}]},
+                    "streaming": False,
+                }
+                start = time.monotonic()
+                async with client.stream("POST", "/run_sse", json=body) as response:
+                    async for _ in response.aiter_bytes():
+                        pass
+                if response.status_code == 200:
+                    latencies.append(time.monotonic() - start)
+
+        start = time.monotonic()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.monotonic() - start
+    return latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--app", default="finance_agent")
+    parser.add_argument("--query", default=None, help="Defaults to a portfolio analysis of a generated CSV.")
+    parser.add_argument("--portfolio-rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    query = args.query or f"Analyze the portfolio at {_write_sample_portfolio(args.portfolio_rows)}"
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    print(f"{'workers':>8} {'requests':>9} {'req/s':>8} {'p50 s':>8} {'p95 s':>8}")
+    for workers in args.workers:
+        env = dict(os.environ, MAESTRO_WORKERS=str(workers), MAESTRO_PORT=str(args.port), MAESTRO_HOST="127.0.0.1")
+        server = subprocess.Popen([sys.executable, "server.py"], cwd=ROOT, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            latencies, elapsed = asyncio.run(_run_load(base_url, args.app, query, args.concurrency, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+        if not latencies:
+            print(f"{workers:>8} {'no successful requests':>36}")
+            continue
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+        print(f"{workers:>8} {len(latencies):>9} {len(latencies) / elapsed:>8.2f} "
+              f"{statistics.median(latencies):>8.2f} {p95:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from google.adk.agents import Agent
+from google.adk.models import Gemini
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
@@ -6,6 +7,7 @@ import asyncio
 import os
 from dotenv import load_dotenv
 from finance_agent.tools import get_current_datetime, analyze_portfolio_risk
+from maestro_common.tool_budget import record_tool_usage
 
 load_dotenv()
 
@@ -13,9 +15,11 @@ APP_NAME = "finance_agent"
 USER_ID = "user1234"
 SESSION_ID = "1234"
 
+MODEL = Gemini(model="gemini-2.5-flash")
+
 root_agent = Agent(
     name="finance_agent",
-    model="gemini-2.5-flash",
+    model=MODEL,
     description="Agent to help with financial questions and analysis.",
     instruction="""
     You are a helpful finance assistant.
@@ -28,7 +32,8 @@ root_agent = Agent(
     When asked about financial topics, maintain a professional and analytical tone.
     Always check the time if the user asks about "today", "now", or market status.
     """,
-    tools=[get_current_datetime, analyze_portfolio_risk]
+    tools=[get_current_datetime, analyze_portfolio_risk],
+    after_tool_callback=record_tool_usage,
 )
 
 # Session and Runner
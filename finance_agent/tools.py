@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from maestro_common.tool_budget import budgeted
+
 
 def get_current_datetime() -> str:
     """Returns the current date and time.
@@ -12,6 +14,7 @@ def get_current_datetime() -> str:
     # But for a simple tool, returning local system time is usually expected unless specified
     return datetime.now().astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
 
+@budgeted()
 def analyze_portfolio_risk(file_path: str) -> str:
     """Analyzes a portfolio CSV for concentration risk.
     
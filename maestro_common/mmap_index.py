@@ -0,0 +1,139 @@
+"""Versioned, memory-mapped NumPy indexes shared by the local lookup tools.
+
+The artist-similarity index (band_tour_agent/similarity.py) and the movie
+catalog index (movie_agent/recommender.py) are each a directory of `.npy`
+arrays compiled from a CSV and memory-mapped by every worker.
+
+Each build is written to a fresh version directory next to `index_dir`
+(`.<name>.<random>`), and `index_dir` is a symlink that is swapped to the new
+version with a single rename. A worker loading the index resolves the link
+once, so it maps either every old array or every new one, never a mix; a
+worker that already mapped the old version keeps reading it after the swap.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Generic, Iterable, Optional, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+LOAD_ATTEMPTS = 3
+
+
+def save_index(arrays: Dict[str, np.ndarray], index_dir: str) -> None:
+    """Writes `arrays` as a new version of the index and atomically makes it current.
+
+    Args:
+        arrays: Array name -> array; each is saved as `<name>.npy`.
+        index_dir: Path of the index; becomes a symlink to the new version.
+    """
+    index_dir = os.path.abspath(index_dir)
+    parent, base = os.path.split(index_dir)
+    os.makedirs(parent, exist_ok=True)
+    version_dir = tempfile.mkdtemp(prefix=f".{base}.", dir=parent)
+    os.chmod(version_dir, 0o755)
+    for name, array in arrays.items():
+        np.save(os.path.join(version_dir, f"{name}.npy"), array)
+
+    previous = os.path.realpath(index_dir) if os.path.islink(index_dir) else None
+    link = f"{version_dir}.link"
+    try:
+        os.symlink(os.path.basename(version_dir), link)
+    except (OSError, NotImplementedError):
+        # No symlinks (e.g. Windows without developer mode): swap the directory itself.
+        _replace_directory(version_dir, index_dir)
+        return
+    if os.path.isdir(index_dir) and not os.path.islink(index_dir):
+        # A plain directory (an unversioned or empty index) cannot be swapped
+        # atomically; loaders retry through the brief gap.
+        _replace_directory(link, index_dir)
+    else:
+        os.replace(link, index_dir)
+    if previous and previous != version_dir:
+        shutil.rmtree(previous, ignore_errors=True)
+
+
+def _replace_directory(source: str, index_dir: str) -> None:
+    aside = None
+    if os.path.lexists(index_dir):
+        aside = f"{index_dir}.{os.getpid()}.old"
+        os.rename(index_dir, aside)
+    os.rename(source, index_dir)
+    if aside:
+        shutil.rmtree(aside, ignore_errors=True)
+
+
+def load_index(index_dir: str, names: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Memory-maps the arrays `names` from the current version of the index."""
+    names = list(names)
+    for attempt in range(LOAD_ATTEMPTS):
+        version_dir = os.path.realpath(index_dir)
+        try:
+            return {name: np.load(os.path.join(version_dir, f"{name}.npy"), mmap_mode="r") for name in names}
+        except FileNotFoundError:
+            # Another worker swapped in a new version and removed this one mid-load.
+            if attempt == LOAD_ATTEMPTS - 1:
+                raise
+            time.sleep(0.05)
+
+
+def index_is_stale(index_dir: str, names: Iterable[str], source_file: str) -> bool:
+    """Returns whether the index is missing any array or is older than its source file."""
+    paths = [os.path.join(index_dir, f"{name}.npy") for name in names]
+    if not all(os.path.exists(p) for p in paths):
+        return True
+    return os.path.exists(source_file) and os.path.getmtime(source_file) > min(os.path.getmtime(p) for p in paths)
+
+
+class LazyIndex(Generic[T]):
+    """Process-wide index, built from its source file on first use if it is missing or stale.
+
+    Args:
+        load: Opens the index from a directory (e.g. the index class).
+        build: `build(source_file, index_dir)` compiles the index.
+        names: Array names the index consists of.
+        source_file: The file the index is built from.
+        index_dir: Where the index lives.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[str], T],
+        build: Callable[[str, str], int],
+        names: Iterable[str],
+        source_file: str,
+        index_dir: str,
+    ):
+        self._load = load
+        self._build = build
+        self.names = list(names)
+        self.source_file = source_file
+        self.index_dir = index_dir
+        self._index: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    if index_is_stale(self.index_dir, self.names, self.source_file):
+                        self._build(self.source_file, self.index_dir)
+                    self._index = self._load(self.index_dir)
+        return self._index
+
+
+def build_cli(usage: str, build: Callable[[str, str], int], source_file: str, index_dir: str, noun: str) -> None:
+    """Runs `python -m <module> build [source_file] [index_dir]` for an index module."""
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        print(usage)
+        sys.exit(1)
+    source_file = sys.argv[2] if len(sys.argv) > 2 else source_file
+    index_dir = sys.argv[3] if len(sys.argv) > 3 else index_dir
+    count = build(source_file, index_dir)
+    print(f"Indexed {count} {noun} into {index_dir}")
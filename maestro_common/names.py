@@ -0,0 +1,23 @@
+"""Name normalization and hashing shared by the local lookup indexes.
+
+Artist and movie names reach the tools in whatever form the user or model
+typed them ("The Martian", "martian", "Simon & Garfunkel"), so indexes key
+rows on a normalized name and store a stable 64-bit hash of it.
+"""
+
+import hashlib
+import re
+
+
+def normalize_name(name: str) -> str:
+    """Normalizes a name for lookup: case, punctuation, '&'/'and' and a leading 'the' are ignored."""
+    key = name.lower().replace("&", " and ")
+    key = re.sub(r"[^\w]+", " ", key).strip()
+    if key.startswith("the "):
+        key = key[4:]
+    return key
+
+
+def name_hash(key: str) -> int:
+    """Returns a stable 64-bit hash of a normalized name (unlike `hash()`, the same in every process)."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
@@ -0,0 +1,297 @@
+"""Memory-bounded in-memory session storage and on-demand memory reports.
+
+`InMemorySessionService` keeps every event of every session, including the
+full sub-agent answers (workout plans, portfolio reports) returned as tool
+results, so a long-running backend grows with every active user.
+`BoundedInMemorySessionService` caps each session by event count and payload
+size:
+
+1. Once a session is over its byte budget, the payloads of its oldest events
+   are compacted to a short preview, oldest first.
+2. If it is still over either cap, the oldest events are dropped.
+
+Events of the invocation being appended to are never touched, so a running
+turn always sees its own tool results. Identical large texts (the same
+workout file read from several sessions) are interned and stored once.
+
+`memory_report()` shows where the memory goes, per session and per agent,
+plus tracemalloc's view of the process.
+
+The service is registered for `memory://` session URIs in services.py, with
+optional per-URI limits: `memory://?max_events=200&max_bytes=2097152`.
+"""
+
+import json
+import logging
+import os
+import sys
+import tracemalloc
+import weakref
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+from google.genai import types
+
+DEFAULT_MAX_EVENTS = int(os.getenv("MAESTRO_SESSION_MAX_EVENTS", "200"))
+DEFAULT_MAX_BYTES = int(os.getenv("MAESTRO_SESSION_MAX_BYTES", str(2 * 1024 * 1024)))
+INTERN_MIN_CHARS = 1024
+PREVIEW_CHARS = 200
+
+logger = logging.getLogger("maestro.session_store")
+
+# Every live bounded service, so the memory report covers the ADK web app's
+# service and the orchestrator's sub-agent service alike.
+_services: "weakref.WeakSet[BoundedInMemorySessionService]" = weakref.WeakSet()
+_last_snapshot: Optional[tracemalloc.Snapshot] = None
+
+
+def payload_size(event: Event) -> int:
+    """Returns the serialized size of an event's content in bytes."""
+    if not event.content:
+        return 0
+    return len(event.content.model_dump_json(exclude_none=True).encode("utf-8"))
+
+
+def _preview(text: str) -> str:
+    return f"{text[:PREVIEW_CHARS]}\n...[{len(text) - PREVIEW_CHARS} characters evicted from session memory]"
+
+
+def _compact_part(part: types.Part) -> types.Part:
+    if part.text and len(part.text) > PREVIEW_CHARS:
+        return part.model_copy(update={"text": _preview(part.text)})
+    if part.function_response and part.function_response.response:
+        text = json.dumps(part.function_response.response, default=str)
+        if len(text) > PREVIEW_CHARS:
+            response = part.function_response.model_copy(update={"response": {"result": _preview(text)}})
+            return part.model_copy(update={"function_response": response})
+    if part.inline_data:
+        return types.Part(text=f"[{part.inline_data.mime_type or 'inline data'} evicted from session memory]")
+    return part
+
+
+def compact_event(event: Event) -> Event:
+    """Returns a copy of `event` with large text, tool results and inline data cut to a preview."""
+    if not event.content or not event.content.parts:
+        return event
+    parts = [_compact_part(part) for part in event.content.parts]
+    return event.model_copy(update={"content": event.content.model_copy(update={"parts": parts})})
+
+
+class BoundedInMemorySessionService(InMemorySessionService):
+    """`InMemorySessionService` with per-session event and payload-size caps."""
+
+    def __init__(self, max_events: int = DEFAULT_MAX_EVENTS, max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__()
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.stats = {"compacted_events": 0, "evicted_events": 0, "interned_texts": 0, "deduplicated_bytes": 0}
+        # event id -> payload size, so enforcing the caps does not re-serialize every event.
+        self._sizes: Dict[str, int] = {}
+        # Canonical copy of each large text and how many stored events reference it;
+        # an entry is dropped when its last event is compacted, evicted or deleted.
+        self._texts: Dict[str, str] = {}
+        self._text_refs: Dict[str, int] = {}
+        # event id -> the canonical texts it references.
+        self._event_texts: Dict[str, List[str]] = {}
+        _services.add(self)
+
+    @classmethod
+    def from_uri(cls, uri: str) -> "BoundedInMemorySessionService":
+        """Creates a service from a `memory://?max_events=N&max_bytes=N` URI."""
+        params = {key: int(values[-1]) for key, values in parse_qs(urlparse(uri).query).items()}
+        return cls(
+            max_events=params.get("max_events", DEFAULT_MAX_EVENTS),
+            max_bytes=params.get("max_bytes", DEFAULT_MAX_BYTES),
+        )
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+        storage = self.sessions.get(session.app_name, {}).get(session.user_id, {}).get(session.id)
+        if event.partial or storage is None or not storage.events or storage.events[-1] is not event:
+            return event
+        self._intern(event)
+        self._sizes[event.id] = payload_size(event)
+        self._enforce_limits(storage, event.invocation_id)
+        return event
+
+    def _delete_session_impl(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        storage = self.sessions.get(app_name, {}).get(user_id, {}).get(session_id)
+        super()._delete_session_impl(app_name=app_name, user_id=user_id, session_id=session_id)
+        if storage is not None:
+            for event in storage.events:
+                self._sizes.pop(event.id, None)
+                self._release_texts(event.id)
+
+    def _canonical(self, text: Any, held: List[str]) -> Any:
+        if not isinstance(text, str) or len(text) < INTERN_MIN_CHARS:
+            return text
+        canonical = self._texts.setdefault(text, text)
+        if canonical is text:
+            self.stats["interned_texts"] += 1
+        else:
+            self.stats["deduplicated_bytes"] += len(text)
+        self._text_refs[canonical] = self._text_refs.get(canonical, 0) + 1
+        held.append(canonical)
+        return canonical
+
+    def _intern(self, event: Event) -> None:
+        held: List[str] = []
+        for part in (event.content.parts or []) if event.content else []:
+            if part.text:
+                part.text = self._canonical(part.text, held)
+            if part.function_response and isinstance(part.function_response.response, dict):
+                response = part.function_response.response
+                for key, value in response.items():
+                    response[key] = self._canonical(value, held)
+        if held:
+            self._event_texts[event.id] = held
+
+    def _release_texts(self, event_id: str) -> None:
+        """Drops an event's references to interned texts, forgetting texts no event uses any more."""
+        for text in self._event_texts.pop(event_id, ()):
+            self._text_refs[text] -= 1
+            if not self._text_refs[text]:
+                del self._text_refs[text]
+                del self._texts[text]
+
+    def _enforce_limits(self, storage: Session, current_invocation: str) -> None:
+        events = storage.events
+        total = sum(self._sizes.get(e.id, 0) for e in events)
+        if len(events) <= self.max_events and total <= self.max_bytes:
+            return
+
+        for i, event in enumerate(events):
+            if total <= self.max_bytes or event.invocation_id == current_invocation:
+                break
+            size = self._sizes.get(event.id, 0)
+            if size <= 2 * PREVIEW_CHARS:
+                continue
+            events[i] = compact_event(event)
+            # Compaction replaces every interned (large) text with a short preview.
+            self._release_texts(event.id)
+            self._sizes[event.id] = payload_size(events[i])
+            total -= size - self._sizes[event.id]
+            self.stats["compacted_events"] += 1
+
+        drop = 0
+        while (
+            drop < len(events)
+            and (len(events) - drop > self.max_events or total > self.max_bytes)
+            and events[drop].invocation_id != current_invocation
+        ):
+            total -= self._sizes.pop(events[drop].id, 0)
+            self._release_texts(events[drop].id)
+            drop += 1
+        if drop:
+            del events[:drop]
+            self.stats["evicted_events"] += drop
+            logger.debug("Evicted %d events from session %s", drop, storage.id)
+
+
+def _retained_size(obj: Any, seen: set) -> int:
+    """Approximates the memory held by `obj`, counting objects already in `seen` as free."""
+    if id(obj) in seen or obj is None or isinstance(obj, (bool, int, float)):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        # Copied first: the report runs in a thread while the event loop keeps appending.
+        size += sum(_retained_size(k, seen) + _retained_size(v, seen) for k, v in list(obj.items()))
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_retained_size(item, seen) for item in list(obj))
+    elif hasattr(obj, "__dict__"):
+        size += _retained_size(vars(obj), seen)
+    return size
+
+
+def _tracemalloc_report(top: int) -> Dict[str, Any]:
+    global _last_snapshot
+    if not tracemalloc.is_tracing():
+        return {"tracing": False}
+    snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    current, peak = tracemalloc.get_traced_memory()
+    report = {
+        "tracing": True,
+        "current_bytes": current,
+        "peak_bytes": peak,
+        "top_allocations": [
+            {"where": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+            for stat in snapshot.statistics("lineno")[:top]
+        ],
+    }
+    if _last_snapshot is not None:
+        report["growth_since_last_report"] = [
+            {"where": str(stat.traceback), "size_diff_bytes": stat.size_diff, "count_diff": stat.count_diff}
+            for stat in snapshot.compare_to(_last_snapshot, "lineno")[:top]
+        ]
+    _last_snapshot = snapshot
+    return report
+
+
+def memory_report(top: int = 10, trace: Optional[bool] = None) -> Dict[str, Any]:
+    """Reports memory held by in-memory sessions, per session and per agent.
+
+    Session and agent sizes come from walking the stored events (shared
+    objects, such as interned texts, are counted once). The `tracemalloc`
+    section covers the whole process: current and peak traced memory, the
+    top allocation sites, and their growth since the previous report.
+
+    Args:
+        top: Number of sessions and allocation sites to list.
+        trace: True starts tracemalloc (only allocations made from then on are
+            traced), False stops it, None leaves it as is. Tracing can also be
+            enabled from startup with PYTHONTRACEMALLOC=1.
+    """
+    global _last_snapshot
+    if trace and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif trace is False and tracemalloc.is_tracing():
+        tracemalloc.stop()
+        _last_snapshot = None
+
+    seen: set = set()
+    sessions = []
+    agents: Dict[str, Dict[str, int]] = defaultdict(lambda: {"events": 0, "retained_bytes": 0})
+    services = []
+    for service in list(_services):
+        first_session = len(sessions)
+        for app_name, users in list(service.sessions.items()):
+            for user_id, user_sessions in list(users.items()):
+                for session in list(user_sessions.values()):
+                    retained = _retained_size(session.state, seen)
+                    for event in list(session.events):
+                        size = _retained_size(event, seen)
+                        retained += size
+                        agents[event.author]["events"] += 1
+                        agents[event.author]["retained_bytes"] += size
+                    sessions.append({
+                        "app_name": app_name,
+                        "user_id": user_id,
+                        "session_id": session.id,
+                        "events": len(session.events),
+                        "payload_bytes": sum(service._sizes.get(e.id, 0) for e in session.events),
+                        "retained_bytes": retained,
+                    })
+        services.append({
+            "max_events": service.max_events,
+            "max_bytes": service.max_bytes,
+            "sessions": len(sessions) - first_session,
+            "interned_texts_held": len(service._texts),
+            **service.stats,
+        })
+
+    sessions.sort(key=lambda s: s["retained_bytes"], reverse=True)
+    return {
+        "totals": {
+            "sessions": len(sessions),
+            "events": sum(s["events"] for s in sessions),
+            "retained_bytes": sum(s["retained_bytes"] for s in sessions),
+        },
+        "services": services,
+        "sessions": sessions[:top],
+        "agents": dict(sorted(agents.items(), key=lambda item: item[1]["retained_bytes"], reverse=True)),
+        "tracemalloc": _tracemalloc_report(top),
+    }
@@ -0,0 +1,188 @@
+"""Output-size budgets and per-turn token accounting for agent tools.
+
+Every tool result is read by the model on each loop iteration of a turn, so
+large outputs (whole workout files, full preference JSON) slow down every
+turn for users with big libraries. `budgeted` caps a tool's output,
+`paginate` returns list pages that already fit a budget, and
+`record_tool_usage` (an `after_tool_callback`) tallies the estimated tokens
+each tool returned per agent turn so heavy tools show up in
+`tool_usage_report()`.
+"""
+
+import functools
+import json
+import logging
+import math
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+DEFAULT_MAX_CHARS = int(os.getenv("MAESTRO_TOOL_OUTPUT_MAX_CHARS", "4000"))
+# Rough average for English text with Gemini tokenizers; good enough for budgeting.
+CHARS_PER_TOKEN = 4
+MAX_TRACKED_TURNS = 200
+
+logger = logging.getLogger("maestro.tool_budget")
+
+# (agent name, invocation id) -> tool name -> {"calls", "tokens"}
+_usage: "OrderedDict[tuple, Dict[str, Dict[str, int]]]" = OrderedDict()
+
+
+def _as_text(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value, default=str)
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimates how many tokens the model reads for a tool result."""
+    return math.ceil(len(_as_text(value)) / CHARS_PER_TOKEN)
+
+
+def _fit_list(items: list, max_chars: int) -> list:
+    kept, used = [], 2
+    for item in items:
+        used += len(json.dumps(item, default=str)) + 2
+        if used > max_chars:
+            break
+        kept.append(item)
+    return kept
+
+
+def _cut_text(text: str, max_chars: int, hint: str = "") -> str:
+    note = f"truncated {len(text) - max_chars} characters"
+    return f"{text[:max_chars]}\n...[{note}; {hint}]" if hint else f"{text[:max_chars]}\n...[{note}]"
+
+
+def truncate_output(value: Any, max_chars: int = DEFAULT_MAX_CHARS, hint: str = "") -> Any:
+    """Trims a tool result to roughly `max_chars` characters of serialized output.
+
+    Truncation metadata never goes inside the data itself:
+
+    - Strings are cut, with a note saying how much was cut.
+    - Lists keep their leading items and are returned as
+      {"items": [...], "omitted": n}.
+    - Dicts keep every key while their largest values are trimmed. The
+      number of items dropped from each list value is reported in an
+      "omitted" field ({key: n}).
+    - Anything else is serialized to JSON and cut like a string.
+
+    Args:
+        value: The tool result.
+        max_chars: The output budget.
+        hint: How to get the rest, e.g. "page on with `offset`". Only pass one
+            for tools that can return the rest; it is added to the string note
+            or as a "hint" field.
+    """
+    text = _as_text(value)
+    if len(text) <= max_chars:
+        return value
+    if isinstance(value, list):
+        kept = _fit_list(value, max_chars - len(hint) - 40)
+        result = {"items": kept, "omitted": len(value) - len(kept)}
+        if hint:
+            result["hint"] = hint
+        return result
+    if isinstance(value, dict):
+        trimmed: Dict[str, Any] = dict(value)
+        omitted: Dict[str, int] = {}
+        # Room for the "omitted" and "hint" fields.
+        budget = max_chars - len(hint) - 20 - sum(len(k) + 8 for k, v in value.items() if isinstance(v, list))
+        for key in sorted(value, key=lambda k: len(_as_text(value[k])), reverse=True):
+            overflow = len(_as_text(trimmed)) - budget
+            if overflow <= 0:
+                break
+            item = value[key]
+            item_budget = max(len(_as_text(item)) - overflow, 0)
+            if isinstance(item, list):
+                trimmed[key] = _fit_list(item, item_budget)
+                omitted[key] = len(item) - len(trimmed[key])
+            elif isinstance(item, dict):
+                trimmed[key] = truncate_output(item, item_budget)
+            elif isinstance(item, str):
+                trimmed[key] = _cut_text(item, item_budget)
+        if omitted:
+            trimmed["omitted"] = omitted
+        if hint:
+            trimmed["hint"] = hint
+        return trimmed
+    return _cut_text(text, max_chars, hint)
+
+
+def paginate(
+    items: Sequence, offset: int = 0, limit: int = 20, max_limit: int = 100, max_chars: int = DEFAULT_MAX_CHARS
+) -> Dict[str, Any]:
+    """Returns one page of `items` that fits in `max_chars` of serialized output.
+
+    The page holds up to `limit` items (clamped to 1..`max_limit`), fewer if
+    they would not fit the budget, and 'next_offset' points just past the last
+    item returned, so paging on from it never skips anything.
+
+    Returns:
+        A dictionary with the page ('items'), the 'total' number of items and
+        'next_offset' (None when there are no more).
+    """
+    offset = max(offset, 0)
+    limit = min(max(limit, 1), max_limit)
+    page = {"items": [], "total": len(items), "next_offset": len(items)}
+    used = len(_as_text(page))
+    for item in items[offset:offset + limit]:
+        used += len(json.dumps(item, default=str)) + 2
+        if used > max_chars and page["items"]:
+            break
+        page["items"].append(item)
+    end = offset + len(page["items"])
+    page["next_offset"] = end if end < len(items) else None
+    return page
+
+
+def budgeted(max_chars: int = DEFAULT_MAX_CHARS, hint: str = ""):
+    """Decorator enforcing an output-size budget on a tool function.
+
+    The wrapped function keeps its name, docstring and signature, so ADK
+    builds the same tool declaration from it. Never put a budget on a tool
+    whose output the model may write back (e.g. through a "save" tool): a
+    truncated copy would overwrite the full data.
+
+    Args:
+        max_chars: The output budget.
+        hint: Passed to `truncate_output`; set only if the tool can return the rest.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return truncate_output(fn(*args, **kwargs), max_chars, hint)
+
+        return wrapper
+
+    return decorator
+
+
+def record_tool_usage(tool, args: Dict[str, Any], tool_context, tool_response: Any) -> Optional[dict]:
+    """`after_tool_callback` that tallies estimated tokens per tool for the current agent turn."""
+    key = (tool_context.agent_name, tool_context.invocation_id)
+    turn = _usage.get(key)
+    if turn is None:
+        turn = _usage[key] = {}
+        while len(_usage) > MAX_TRACKED_TURNS:
+            _usage.popitem(last=False)
+    entry = turn.setdefault(tool.name, {"calls": 0, "tokens": 0})
+    tokens = estimate_tokens(tool_response)
+    entry["calls"] += 1
+    entry["tokens"] += tokens
+    logger.debug("%s/%s returned ~%d tokens", tool_context.agent_name, tool.name, tokens)
+    return None
+
+
+def tool_usage_report(last_turns: int = 20) -> list:
+    """Returns per-tool token usage for the most recent agent turns, newest first."""
+    report = []
+    for (agent_name, invocation_id), tools in reversed(_usage.items()):
+        report.append({
+            "agent": agent_name,
+            "invocation_id": invocation_id,
+            "total_tokens": sum(t["tokens"] for t in tools.values()),
+            "tools": tools,
+        })
+        if len(report) >= last_turns:
+            break
+    return report
@@ -6,7 +6,12 @@ def main():
     print("Welcome to Maestro Agentic!")
     print("I can help you with search, finding concerts, or planning workouts.")
     print("Type 'exit' or 'quit' to stop.")
-    
+
+    # Reuse one event loop for the whole session: the agents' model clients
+    # keep pooled connections that are bound to the loop they were opened on.
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
     while True:
         try:
             user_input = input("\nYou: ")
@@ -17,12 +22,14 @@ def main():
             if not user_input.strip():
                 continue
             
-            asyncio.run(call_agent_async(user_input))
+            loop.run_until_complete(call_agent_async(user_input))
         except KeyboardInterrupt:
             print("\nGoodbye!")
             break
         except Exception as e:
             print(f"An error occurred: {e}")
 
+    loop.close()
+
 if __name__ == "__main__":
     main()
@@ -1,4 +1,5 @@
 from google.adk.agents import Agent
+from google.adk.models import Gemini
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.adk.tools import FunctionTool, AgentTool
@@ -6,7 +7,8 @@ from google.adk.tools.google_search_agent_tool import create_google_search_agent
 from google.genai import types
 import asyncio
 from dotenv import load_dotenv
-from movie_agent.tools import save_preferences, get_preferences, add_to_watchlist, get_watchlist
+from maestro_common.tool_budget import record_tool_usage
+from movie_agent.tools import save_preferences, update_preferences, get_preferences, get_preferences_summary, add_to_watchlist, get_watchlist, recommend_movies
 
 load_dotenv()
 
@@ -14,13 +16,15 @@ APP_NAME = "movie_agent"
 USER_ID = "user1234"
 SESSION_ID = "movie_session"
 
+MODEL = Gemini(model="gemini-2.5-flash")
+
 # Create a specialized agent for searching
-search_agent = create_google_search_agent(model="gemini-2.5-flash")
+search_agent = create_google_search_agent(model=MODEL)
 search_tool = AgentTool(agent=search_agent)
 
 root_agent = Agent(
     name="movie_agent",
-    model="gemini-2.5-flash",
+    model=MODEL,
     description="Agent to recommend movies and manage user watchlists.",
     instruction="""
     You are a knowledgeable movie expert and assistant.
@@ -31,21 +35,25 @@ root_agent = Agent(
     3.  Save user preferences to provide personalized recommendations.
     
     Tools:
-    -   `get_preferences`: Retrieve the user's saved preferences and watchlist. Always check this first if the user asks for recommendations.
-    -   `save_preferences`: Save updated preferences (e.g., if the user tells you they like Horror movies).
+    -   `recommend_movies`: Rank the local movie catalog (up to 10 titles) against the user's saved favorite genres, actors and directors, skipping the watchlist. Pass `genre` to restrict to one genre. Use this first for any recommendation.
+    -   `get_preferences_summary`: Retrieve a compact summary of the user's preferences (top genres, actors, directors and the watchlist size). Use it when the user asks what you know about their tastes.
+    -   `get_preferences`: Retrieve the full saved preferences (the watchlist only as a count; use `get_watchlist` for its entries). Only use this when the summary is not enough.
+    -   `update_preferences`: Merge new preferences into the saved ones (e.g., {"favorite_genres": ["Horror"]} if the user tells you they like Horror movies).
+    -   `save_preferences`: Replace all saved preferences (the watchlist is kept). Only use this if the user asks to reset or rewrite their preferences.
     -   `add_to_watchlist`: Add a specific movie to the watchlist.
-    -   `get_watchlist`: List the movies currently in the watchlist.
+    -   `get_watchlist`: List one page of the watchlist. Use `offset` / `limit` to page through long watchlists.
     -   `google_search_agent`: Use wait for finding information about movies, actors, release dates, reviews, or to find recommendations if you don't have enough internal knowledge.
     
     Workflow:
-    -   If the user asks for a recommendation, first check their preferences using `get_preferences`.
-    -   If you need more info about current movies or specific details, use the search tool.
-    -   If the user mentions they like a specific genre or actor, update their preferences using `save_preferences`. merge new preferences with existing ones.
+    -   If the user asks for a recommendation, call `recommend_movies` and present its results, mentioning which of their preferences each movie matches.
+    -   Only use the search tool for recent releases, reviews or details the catalog does not have, or if `recommend_movies` returns nothing suitable.
+    -   If the user mentions they like a specific genre or actor, save it with `update_preferences`; it merges with the existing preferences, so there is no need to read them first.
     -   If the user says "add X to my watchlist", use `add_to_watchlist`.
     
     Be concise, friendly, and enthusiastic about movies.
     """,
-    tools=[FunctionTool(save_preferences), FunctionTool(get_preferences), FunctionTool(add_to_watchlist), FunctionTool(get_watchlist), search_tool]
+    tools=[FunctionTool(save_preferences), FunctionTool(update_preferences), FunctionTool(get_preferences), FunctionTool(get_preferences_summary), FunctionTool(add_to_watchlist), FunctionTool(get_watchlist), FunctionTool(recommend_movies), search_tool],
+    after_tool_callback=record_tool_usage,
 )
 
 # Session and Runner
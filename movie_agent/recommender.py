@@ -0,0 +1,279 @@
+"""Local movie recommendation engine over an on-disk catalog.
+
+The catalog CSV (`title,year,genres,cast,director,rating`, with `|`-separated
+genres and cast) is compiled once into NumPy arrays that are memory-mapped at
+load time, like the artist index in band_tour_agent/similarity.py:
+
+    titles.npy         uint8   UTF-8 titles, concatenated
+    title_offsets.npy  int64   (N + 1,) offsets of each title in titles.npy
+    title_hashes.npy   uint64  (N,) sorted hashes of the normalized titles
+    title_rows.npy     int32   (N,) catalog row of each entry in title_hashes
+    years.npy          int16   (N,)
+    ratings.npy        float32 (N,) 0-10
+    genre_bits.npy     uint32  (N,) one bit per genre in genre_names.npy
+    genre_names.npy    str     (G,) at most 32 genres
+    actor_hashes.npy   uint64  (A,) sorted hashes of normalized actor names; id = position
+    actor_offsets.npy  int64   (A + 1,) offsets of each actor's movies in actor_rows.npy
+    actor_rows.npy     int32   (C,) catalog rows of each actor's movies, ascending per actor
+    director_*.npy             the same three arrays for directors
+
+New builds are swapped in atomically as a whole (see maestro_common/mmap_index.py).
+
+A recommendation scores every title against the user's preference vector
+(liked genres, actors and directors, plus a small rating prior) in one pass
+over these arrays, masks the watchlist, and takes the top k with
+`argpartition`, so a 1M-title catalog is ranked in milliseconds. Cast
+and directors are stored as per-person postings rather than per-movie
+lists, so a liked actor or director costs only as much as the number of
+movies they appear in.
+
+Build or rebuild the index with:
+    python -m movie_agent.recommender build [catalog.csv] [index_dir]
+"""
+
+import csv
+import os
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+from maestro_common.mmap_index import LazyIndex, build_cli, load_index, save_index
+from maestro_common.names import name_hash, normalize_name
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CATALOG_FILE = os.getenv("MAESTRO_MOVIE_CATALOG", os.path.join(DATA_DIR, "movie_catalog.csv"))
+INDEX_DIR = os.getenv("MAESTRO_MOVIE_INDEX_DIR", os.path.join(DATA_DIR, "movie_catalog_index"))
+
+GENRE_WEIGHT = 1.0
+ACTOR_WEIGHT = 1.5
+DIRECTOR_WEIGHT = 2.0
+# Ratings only break ties between titles that match the preferences equally well.
+RATING_WEIGHT = 0.05
+
+_INDEX_FILES = [
+    "titles", "title_offsets", "title_hashes", "title_rows", "years", "ratings", "genre_bits",
+    "genre_names", "actor_hashes", "actor_offsets", "actor_rows",
+    "director_hashes", "director_offsets", "director_rows",
+]
+
+
+def _hash_names(names: Iterable[str]) -> np.ndarray:
+    return np.fromiter((name_hash(normalize_name(n)) for n in names), dtype=np.uint64)
+
+
+def _postings(hashes: np.ndarray, rows: np.ndarray) -> tuple:
+    """Groups (name hash, catalog row) pairs into a sorted hash vocabulary, offsets and rows."""
+    vocab, ids = np.unique(hashes, return_inverse=True)
+    offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ids, minlength=len(vocab)), out=offsets[1:])
+    return vocab, offsets, rows[np.lexsort((rows, ids))].astype(np.int32)
+
+
+def write_index(
+    titles: List[str],
+    years: List[int],
+    ratings: List[float],
+    genres: List[List[str]],
+    cast: List[List[str]],
+    directors: List[str],
+    index_dir: str = INDEX_DIR,
+) -> None:
+    """Writes an index from per-movie columns; entry i of every list belongs to titles[i].
+
+    Args:
+        titles: Movie titles.
+        years: Release years (0 if unknown).
+        ratings: Ratings on a 0-10 scale.
+        genres: Genre names of each movie.
+        cast: Actor names of each movie.
+        directors: Director name of each movie ("" if unknown).
+        index_dir: Where to write the index.
+    """
+    count = len(titles)
+    genre_names = sorted({g for movie in genres for g in movie})
+    if len(genre_names) > 32:
+        raise ValueError(f"At most 32 genres are supported, got {len(genre_names)}.")
+    genre_bit = {g: np.uint32(1 << i) for i, g in enumerate(genre_names)}
+    genre_bits = np.zeros(count, dtype=np.uint32)
+    for row, movie in enumerate(genres):
+        for g in movie:
+            genre_bits[row] |= genre_bit[g]
+
+    cast_rows = np.repeat(np.arange(count, dtype=np.int32), [len(movie) for movie in cast])
+    actors = _postings(_hash_names(actor for movie in cast for actor in movie), cast_rows)
+    directed = np.array([row for row, d in enumerate(directors) if normalize_name(d)], dtype=np.int32)
+    director_postings = _postings(_hash_names(directors[row] for row in directed), directed)
+
+    title_hashes = _hash_names(titles)
+    title_rows = np.argsort(title_hashes, kind="stable").astype(np.int32)
+    encoded = [t.encode("utf-8") for t in titles]
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+
+    arrays = {
+        "titles": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "title_offsets": offsets,
+        "title_hashes": title_hashes[title_rows],
+        "title_rows": title_rows,
+        "years": np.asarray(years, dtype=np.int16),
+        "ratings": np.asarray(ratings, dtype=np.float32),
+        "genre_bits": genre_bits,
+        "genre_names": np.array(genre_names, dtype=str),
+        **dict(zip(["actor_hashes", "actor_offsets", "actor_rows"], actors)),
+        **dict(zip(["director_hashes", "director_offsets", "director_rows"], director_postings)),
+    }
+
+    save_index(arrays, index_dir)
+
+
+def build_index(catalog_file: str = CATALOG_FILE, index_dir: str = INDEX_DIR) -> int:
+    """Builds the index from the catalog CSV.
+
+    Returns:
+        The number of movies in the index.
+    """
+    columns: Dict[str, list] = {"titles": [], "years": [], "ratings": [], "genres": [], "cast": [], "directors": []}
+    with open(catalog_file, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            title = row["title"].strip()
+            if not title:
+                continue
+            columns["titles"].append(title)
+            columns["years"].append(int(row.get("year") or 0))
+            columns["ratings"].append(float(row.get("rating") or 0.0))
+            columns["genres"].append([g.strip() for g in (row.get("genres") or "").split("|") if g.strip()])
+            columns["cast"].append([a.strip() for a in (row.get("cast") or "").split("|") if a.strip()])
+            columns["directors"].append((row.get("director") or "").strip())
+    write_index(index_dir=index_dir, **columns)
+    return len(columns["titles"])
+
+
+def _lookup_ids(hashes: np.ndarray, names: Iterable[str]) -> np.ndarray:
+    """Maps names to their distinct ids in a sorted hash vocabulary, dropping unknown names."""
+    targets = _hash_names(names)
+    if not len(targets) or not len(hashes):
+        return np.empty(0, dtype=np.int32)
+    ids = np.minimum(np.searchsorted(hashes, targets), len(hashes) - 1)
+    # np.unique: spellings of the same name ("Tom Hardy", "tom hardy") count once.
+    return np.unique(ids[hashes[ids] == targets]).astype(np.int32)
+
+
+def _distinct(names: Iterable[str]) -> List[str]:
+    """Drops names that normalize to one already seen, keeping the first spelling."""
+    seen, result = set(), []
+    for name in names:
+        key = normalize_name(name)
+        if key and key not in seen:
+            seen.add(key)
+            result.append(name)
+    return result
+
+
+class MovieIndex:
+    """Memory-mapped movie catalog with vectorized preference scoring."""
+
+    def __init__(self, index_dir: str = INDEX_DIR):
+        for name, array in load_index(index_dir, _INDEX_FILES).items():
+            setattr(self, name, array)
+        self.genre_list = [str(g) for g in self.genre_names]
+
+    def __len__(self) -> int:
+        return len(self.ratings)
+
+    def title_at(self, row: int) -> str:
+        start, end = self.title_offsets[row], self.title_offsets[row + 1]
+        return self.titles[start:end].tobytes().decode("utf-8")
+
+    def genres_of(self, row: int) -> List[str]:
+        bits = int(self.genre_bits[row])
+        return [g for i, g in enumerate(self.genre_list) if bits >> i & 1]
+
+    def _genre_mask(self, names: Iterable[str]) -> int:
+        wanted = {normalize_name(n) for n in names}
+        return sum(1 << i for i, g in enumerate(self.genre_list) if normalize_name(g) in wanted)
+
+    def rows_for_titles(self, titles: Iterable[str]) -> np.ndarray:
+        """Returns the catalog rows of every movie with one of the given titles."""
+        targets = _hash_names(titles)
+        start = np.searchsorted(self.title_hashes, targets, side="left")
+        end = np.searchsorted(self.title_hashes, targets, side="right")
+        return np.concatenate([self.title_rows[s:e] for s, e in zip(start, end)] + [np.empty(0, dtype=np.int32)])
+
+    def _movies_of(self, kind: str, names: Iterable[str]) -> List[np.ndarray]:
+        """Returns the catalog rows of each known actor or director (`kind`) in `names`."""
+        hashes, offsets, rows = (getattr(self, f"{kind}_{part}") for part in ("hashes", "offsets", "rows"))
+        return [rows[offsets[i]:offsets[i + 1]] for i in _lookup_ids(hashes, names)]
+
+    def score(self, genres: List[str], actors: List[str], directors: List[str]) -> np.ndarray:
+        """Scores every movie against the preferences; higher is a better match."""
+        scores = self.ratings * np.float32(RATING_WEIGHT)
+        genre_mask = self._genre_mask(genres)
+        for i in range(len(self.genre_list)):
+            if genre_mask >> i & 1:
+                scores += np.float32(GENRE_WEIGHT) * ((self.genre_bits & np.uint32(1 << i)) != 0)
+
+        for kind, names, weight in (("actor", actors, ACTOR_WEIGHT), ("director", directors, DIRECTOR_WEIGHT)):
+            for movies in self._movies_of(kind, names):
+                scores[movies] += np.float32(weight)
+        return scores
+
+    def recommend(
+        self,
+        genres: List[str],
+        actors: List[str],
+        directors: List[str],
+        exclude_titles: Iterable[str] = (),
+        k: int = 5,
+        genre: str = "",
+    ) -> List[Dict[str, Any]]:
+        """Returns the `k` best-matching movies, best first, skipping `exclude_titles`.
+
+        If `genre` is given, only movies of that genre are considered.
+        """
+        genres, actors, directors = _distinct(genres), _distinct(actors), _distinct(directors)
+        scores = self.score(genres, actors, directors)
+        if genre:
+            required = self._genre_mask([genre])
+            if not required:
+                return []
+            scores[(self.genre_bits & np.uint32(required)) == 0] = -np.inf
+        scores[self.rows_for_titles(exclude_titles)] = -np.inf
+
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(scores, len(scores) - k)[-k:]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [self._describe(int(row), float(scores[row]), genres, actors, directors)
+                for row in top if np.isfinite(scores[row])]
+
+    def _describe(self, row: int, score: float, genres: List[str], actors: List[str], directors: List[str]) -> Dict[str, Any]:
+        movie_genres = self.genres_of(row)
+        liked_genres = {normalize_name(g) for g in genres}
+        matches = [g for g in movie_genres if normalize_name(g) in liked_genres]
+        for kind, names in (("actor", actors), ("director", directors)):
+            for name in names:
+                for movies in self._movies_of(kind, [name]):
+                    position = np.searchsorted(movies, row)
+                    if position < len(movies) and movies[position] == row:
+                        matches.append(name)
+        return {
+            "title": self.title_at(row),
+            "year": int(self.years[row]) or None,
+            "genres": movie_genres,
+            "rating": round(float(self.ratings[row]), 1),
+            "score": round(score, 2),
+            "matches": matches,
+        }
+
+
+_index = LazyIndex(MovieIndex, build_index, _INDEX_FILES, CATALOG_FILE, INDEX_DIR)
+
+
+def get_index() -> MovieIndex:
+    """Returns the shared index, building it from the catalog first if it is missing or stale."""
+    return _index.get()
+
+
+if __name__ == "__main__":
+    build_cli(__doc__, build_index, CATALOG_FILE, INDEX_DIR, "movies")
@@ -1,46 +1,165 @@
 import os
+import copy
 import json
+import threading
+from contextlib import contextmanager
 from typing import Dict, Any, List
 
+from maestro_common.tool_budget import budgeted, paginate
+from movie_agent.recommender import get_index
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only.
+    fcntl = None
+
 DATA_DIR = "movie_data"
 PREFERENCES_FILE = os.path.join(DATA_DIR, "user_preferences.json")
+LOCK_FILE = PREFERENCES_FILE + ".lock"
+WATCHLIST_PAGE_CHARS = 2000
+# recommend_movies returns at most MAX_RECOMMENDATIONS entries of up to about
+# RECOMMENDATION_CHARS each (a long title, three genres, three matches), so a full
+# answer always fits its budget.
+MAX_RECOMMENDATIONS = 10
+MAX_MATCHES = 3
+RECOMMENDATION_CHARS = 300
+
+_thread_lock = threading.Lock()
+
+# Parsed preferences, keyed on the file's stat so writes from other worker
+# processes are picked up on the next read.
+_preferences_cache: Dict[str, Any] = {"key": None, "data": {}}
 
 def _ensure_data_dir():
     if not os.path.exists(DATA_DIR):
         os.makedirs(DATA_DIR)
 
+@contextmanager
+def _preferences_lock():
+    """Serializes writes to the preferences file across threads and worker processes."""
+    _ensure_data_dir()
+    with _thread_lock, open(LOCK_FILE, "a") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+def _write_preferences(preferences: Dict[str, Any]) -> None:
+    # Write to a temp file and rename so readers never see a partial file.
+    tmp_path = f"{PREFERENCES_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(preferences, f, indent=4)
+    os.replace(tmp_path, PREFERENCES_FILE)
+
 def save_preferences(preferences: Dict[str, Any]) -> str:
-    """Saves user movie preferences to a file.
+    """Saves user movie preferences to a file, replacing the saved ones.
+
+    The watchlist is kept unless `preferences` contains a 'watchlist' (use
+    `add_to_watchlist` to add to it).
 
     Args:
-        preferences: A dictionary containing user preferences (e.g., favorite_genres, favorite_actors, watch_list).
+        preferences: A dictionary containing user preferences (e.g., favorite_genres, favorite_actors).
     
     Returns:
         A confirmation message.
     """
     try:
-        _ensure_data_dir()
-        with open(PREFERENCES_FILE, 'w') as f:
-            json.dump(preferences, f, indent=4)
+        with _preferences_lock():
+            preferences = dict(preferences)
+            preferences.pop('watchlist_count', None)
+            stored = _load_preferences()
+            if 'watchlist' not in preferences and 'watchlist' in stored:
+                preferences['watchlist'] = stored['watchlist']
+            _write_preferences(preferences)
         return "Preferences saved successfully."
     except Exception as e:
         return f"Error saving preferences: {e}"
 
-def get_preferences() -> Dict[str, Any]:
-    """Retrieves saved user movie preferences.
-
-    Returns:
-        A dictionary containing user preferences. Returns an empty dict if no preferences are found.
-    """
+def _load_preferences() -> Dict[str, Any]:
     try:
         if not os.path.exists(PREFERENCES_FILE):
             return {}
-        with open(PREFERENCES_FILE, 'r') as f:
-            return json.load(f)
+        stat = os.stat(PREFERENCES_FILE)
+        key = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if _preferences_cache["key"] != key:
+            with open(PREFERENCES_FILE, 'r') as f:
+                _preferences_cache["data"] = json.load(f)
+            _preferences_cache["key"] = key
+        return copy.deepcopy(_preferences_cache["data"])
     except Exception as e:
         print(f"Error reading preferences: {e}")
         return {}
 
+def update_preferences(updates: Dict[str, Any]) -> str:
+    """Merges new preferences into the saved ones without needing to read them first.
+
+    List values (e.g. favorite_genres, favorite_actors) are appended to the saved lists,
+    skipping duplicates; other values replace the saved value.
+
+    Args:
+        updates: The preferences to merge, e.g. {"favorite_genres": ["Horror"]}.
+
+    Returns:
+        A confirmation message.
+    """
+    try:
+        with _preferences_lock():
+            prefs = _load_preferences()
+            for key, value in updates.items():
+                if isinstance(value, list) and isinstance(prefs.get(key), list):
+                    prefs[key] += [v for v in value if v not in prefs[key]]
+                else:
+                    prefs[key] = value
+            _write_preferences(prefs)
+        return "Preferences saved successfully."
+    except Exception as e:
+        return f"Error saving preferences: {e}"
+
+def get_preferences() -> Dict[str, Any]:
+    """Retrieves all saved user movie preferences except the watchlist entries.
+
+    Prefer `get_preferences_summary` unless every entry is needed. Use `get_watchlist`
+    to page through the watchlist.
+
+    Returns:
+        A dictionary containing user preferences and 'watchlist_count'. Returns an empty
+        dict if no preferences are found.
+    """
+    # Not budgeted: the model may pass this back to save_preferences, so it must never be cut.
+    # The watchlist, the only list that grows without bound, is paged by get_watchlist instead.
+    prefs = _load_preferences()
+    if 'watchlist' in prefs:
+        prefs['watchlist_count'] = len(prefs.pop('watchlist'))
+    return prefs
+
+@budgeted(1500, hint="lower `max_items`")
+def get_preferences_summary(max_items: int = 5) -> Dict[str, Any]:
+    """Retrieves a compact summary of the user's movie preferences.
+
+    Args:
+        max_items: Maximum number of entries to include from each list (e.g. favorite_genres).
+
+    Returns:
+        A dictionary with the first entries of each preference list, the total count of any
+        list that was shortened (as '<key>_count'), and the number of movies in the watchlist.
+    """
+    prefs = _load_preferences()
+    summary = {}
+    for key, value in prefs.items():
+        if key == 'watchlist':
+            continue
+        if isinstance(value, list):
+            summary[key] = value[:max_items]
+            if len(value) > max_items:
+                summary[f"{key}_count"] = len(value)
+        else:
+            summary[key] = value
+    summary['watchlist_count'] = len(prefs.get('watchlist', []))
+    return summary
+
 def add_to_watchlist(movie_name: str) -> str:
     """Adds a movie to the user's watchlist.
 
@@ -50,21 +169,74 @@ def add_to_watchlist(movie_name: str) -> str:
     Returns:
         Status message.
     """
-    prefs = get_preferences()
-    if 'watchlist' not in prefs:
-        prefs['watchlist'] = []
-    
-    if movie_name not in prefs['watchlist']:
-        prefs['watchlist'].append(movie_name)
-        return save_preferences(prefs)
-    else:
-        return f"'{movie_name}' is already in your watchlist."
+    try:
+        # Hold the lock across the read-modify-write so concurrent adds are not lost.
+        with _preferences_lock():
+            prefs = _load_preferences()
+            if 'watchlist' not in prefs:
+                prefs['watchlist'] = []
+
+            if movie_name in prefs['watchlist']:
+                return f"'{movie_name}' is already in your watchlist."
+            prefs['watchlist'].append(movie_name)
+            _write_preferences(prefs)
+        return "Preferences saved successfully."
+    except Exception as e:
+        return f"Error saving preferences: {e}"
+
+@budgeted(WATCHLIST_PAGE_CHARS, hint="page on with `offset`")
+def get_watchlist(offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+    """Retrieves one page of the user's watchlist.
 
-def get_watchlist() -> List[str]:
-    """Retrieves the user's watchlist.
+    Args:
+        offset: Index of the first movie to return.
+        limit: Maximum number of movies to return (at most 100; a page is cut short if it would not fit the output budget).
 
     Returns:
-        A list of movie names in the watchlist.
+        A dictionary with the page of movie names ('items'), the 'total' number of movies,
+        and 'next_offset' to pass for the next page (None when there are no more).
     """
-    prefs = get_preferences()
-    return prefs.get('watchlist', [])
+    return paginate(_load_preferences().get('watchlist', []), offset, limit, max_chars=WATCHLIST_PAGE_CHARS)
+
+def _as_list(value: Any) -> List[str]:
+    return [value] if isinstance(value, str) else list(value or [])
+
+@budgeted(MAX_RECOMMENDATIONS * RECOMMENDATION_CHARS + 300)
+def recommend_movies(k: int = 5, genre: str = "") -> Dict[str, Any]:
+    """Recommends movies from the local catalog that best match the user's saved preferences.
+
+    Movies already in the watchlist are skipped. Titles are ranked by how many of the
+    user's favorite genres, actors and directors they match, then by rating.
+
+    Args:
+        k: How many movies to recommend (at most 10).
+        genre: Only recommend movies of this genre (e.g. "Sci-Fi"); empty for any genre.
+
+    Returns:
+        A dictionary with the 'recommendations' (title, year, genres, rating and up to
+        three of the preferences each one 'matches'), best first.
+    """
+    prefs = _load_preferences()
+    k = min(max(k, 1), MAX_RECOMMENDATIONS)
+    try:
+        recommendations = get_index().recommend(
+            genres=_as_list(prefs.get('favorite_genres')),
+            actors=_as_list(prefs.get('favorite_actors')),
+            directors=_as_list(prefs.get('favorite_directors')),
+            exclude_titles=_as_list(prefs.get('watchlist')),
+            k=k,
+            genre=genre,
+        )
+    except Exception as e:
+        return {'recommendations': [], 'error': f"Movie catalog unavailable: {e}"}
+    # The ranking score means nothing to the model; the matches explain the order.
+    recommendations = [
+        {**{key: value for key, value in movie.items() if key != 'score'}, 'matches': movie['matches'][:MAX_MATCHES]}
+        for movie in recommendations
+    ]
+    result = {'recommendations': recommendations}
+    if not any(prefs.get(key) for key in ('favorite_genres', 'favorite_actors', 'favorite_directors')):
+        result['note'] = "No saved favorites yet; these are the top-rated titles. Ask the user what they like."
+    elif not recommendations:
+        result['note'] = "No catalog movies match; fall back to the search tool."
+    return result
@@ -13,10 +13,13 @@
 # limitations under the License.
 
 from google.adk.agents import Agent
+from google.adk.models import Gemini
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 import asyncio
+import uuid
+from datetime import date
 from dotenv import load_dotenv
 
 # Import other agents
@@ -26,6 +29,17 @@ from band_tour_agent.agent import root_agent as band_tour_agent
 from workout_agent.agent import root_agent as workout_agent
 from finance_agent.agent import root_agent as finance_agent
 from movie_agent.agent import root_agent as movie_agent
+from maestro_common.session_store import BoundedInMemorySessionService
+from maestro_common.tool_budget import record_tool_usage
+from orchestrator_agent.coalesce import SingleFlight, coalesce_key
+from orchestrator_agent.resilience import (
+    DeadlineExceeded,
+    DegradedAnswer,
+    Upstream,
+    begin_turn,
+    note_degraded,
+    track_degraded,
+)
 
 load_dotenv()
 
@@ -33,29 +47,111 @@ APP_NAME = "orchestrator_agent"
 USER_ID = "user1234"
 SESSION_ID = "orchestrator_session"
 
+# A single model instance keeps its API client (and its pooled HTTPS
+# connections) alive across calls instead of building a new one per request.
+MODEL = Gemini(model="gemini-2.5-flash")
+
 # Define tools to call other agents
 
+# Resilience policy per sub-agent. Only the read-only agents are retried;
+# the workout and movie agents write to disk, so they get a single attempt
+# and no cached fallback.
+UPSTREAMS = {
+    "search_agent": Upstream("search agent", timeout=30, attempts=3, hedge=True),
+    "band_tour_agent": Upstream("band tour agent", timeout=90, attempts=2),
+    "workout_agent": Upstream("workout agent", timeout=90, cache_size=0),
+    "finance_agent": Upstream("finance agent", timeout=60, attempts=2),
+    "movie_agent": Upstream("movie agent", timeout=60, cache_size=0),
+}
+
+# Read-only agents whose answers are safe to share between concurrent
+# identical requests. SINGLE_FLIGHT.stats counts how many calls were coalesced.
+COALESCED_AGENTS = {"search_agent", "band_tour_agent"}
+SINGLE_FLIGHT = SingleFlight()
+
+
+# Runners for the orchestrator and its sub-agents are built once (see
+# get_runner) and reused. Each delegated call or batch query gets its own
+# short-lived session, so concurrent and hedged calls never share state.
+SUB_AGENTS = {
+    "search_agent": search_agent,
+    "band_tour_agent": band_tour_agent,
+    "workout_agent": workout_agent,
+    "finance_agent": finance_agent,
+    "movie_agent": movie_agent,
+}
+_session_service = BoundedInMemorySessionService()
+_runners = {}
+
+
+def get_runner(app_name: str) -> Runner:
+    """Returns the shared Runner for the orchestrator or one of its sub-agents, building it on first use."""
+    runner = _runners.get(app_name)
+    if runner is None:
+        agent = root_agent if app_name == APP_NAME else SUB_AGENTS[app_name]
+        runner = Runner(agent=agent, app_name=app_name, session_service=_session_service)
+        _runners[app_name] = runner
+    return runner
+
+
+async def _run_sub_agent(app_name: str, session_suffix: str, query: str, empty_response: str = "") -> str:
+    """Runs a single query against a sub-agent in a fresh session and returns its final response."""
+    runner = get_runner(app_name)
+    sub_session_id = f"{SESSION_ID}_{session_suffix}_{uuid.uuid4().hex[:8]}"
+    await _session_service.create_session(app_name=app_name, user_id=USER_ID, session_id=sub_session_id)
+
+    try:
+        content = types.Content(role='user', parts=[types.Part(text=query)])
+        events = runner.run_async(user_id=USER_ID, session_id=sub_session_id, new_message=content)
+
+        response_text = empty_response
+        async for event in events:
+            if event.is_final_response():
+                if event.content and event.content.parts:
+                    response_text = event.content.parts[0].text
+    finally:
+        await _session_service.delete_session(app_name=app_name, user_id=USER_ID, session_id=sub_session_id)
+
+    return response_text
+
+
+async def _delegate(app_name: str, session_suffix: str, query: str, empty_response: str = "") -> str:
+    """Delegates a query to a sub-agent under its resilience policy, coalescing identical in-flight queries."""
+    # Answers depend on the date (upcoming tours, news), so it is part of the key
+    # for both the fallback cache and coalescing: yesterday's answer is never served.
+    key = coalesce_key(app_name, query, date.today().isoformat())
+
+    def call():
+        return UPSTREAMS[app_name].call(
+            key,
+            lambda: _run_sub_agent(app_name, session_suffix, query, empty_response),
+        )
+
+    if app_name not in COALESCED_AGENTS:
+        result = await call()
+    else:
+        try:
+            result = await SINGLE_FLIGHT.do(key, call)
+        except DeadlineExceeded as e:
+            result = DegradedAnswer(
+                f"Error: the {UPSTREAMS[app_name].name} did not answer within this turn's deadline. "
+                "Please try again shortly.",
+                f"{UPSTREAMS[app_name].name}: {e}",
+            )
+    # Noted here rather than in the shared execution, so every coalesced caller sees it.
+    if isinstance(result, DegradedAnswer):
+        note_degraded(result.reason)
+        return str(result)
+    return result
+
+
 async def ask_search_agent(query: str) -> str:
     """Delegates a general search or information query to the search agent.
     
     Args:
         query: The user's question or search query.
     """
-    session_service = InMemorySessionService()
-    sub_session_id = f"{SESSION_ID}_search"
-    
-    await session_service.create_session(app_name="search_agent", user_id=USER_ID, session_id=sub_session_id)
-    runner = Runner(agent=search_agent, app_name="search_agent", session_service=session_service)
-    
-    content = types.Content(role='user', parts=[types.Part(text=query)])
-    events = runner.run_async(user_id=USER_ID, session_id=sub_session_id, new_message=content)
-    
-    response_text = ""
-    async for event in events:
-        if event.is_final_response():
-            response_text = event.content.parts[0].text
-            
-    return response_text
+    return await _delegate("search_agent", "search", query)
 
 async def ask_band_tour_agent(query: str) -> str:
     """Delegates a request to find concerts or band tour dates to the band tour agent.
@@ -63,21 +159,7 @@ async def ask_band_tour_agent(query: str) -> str:
     Args:
         query: The user's request regarding bands, concerts, or tour dates.
     """
-    session_service = InMemorySessionService()
-    sub_session_id = f"{SESSION_ID}_band"
-    
-    await session_service.create_session(app_name="band_tour_agent", user_id=USER_ID, session_id=sub_session_id)
-    runner = Runner(agent=band_tour_agent, app_name="band_tour_agent", session_service=session_service)
-    
-    content = types.Content(role='user', parts=[types.Part(text=query)])
-    events = runner.run_async(user_id=USER_ID, session_id=sub_session_id, new_message=content)
-    
-    response_text = ""
-    async for event in events:
-        if event.is_final_response():
-            response_text = event.content.parts[0].text
-            
-    return response_text
+    return await _delegate("band_tour_agent", "band", query)
 
 async def ask_workout_agent(query: str) -> str:
     """Delegates a request to generate, save, or list workouts to the workout agent.
@@ -85,21 +167,7 @@ async def ask_workout_agent(query: str) -> str:
     Args:
         query: The user's request regarding workouts.
     """
-    session_service = InMemorySessionService()
-    sub_session_id = f"{SESSION_ID}_workout"
-    
-    await session_service.create_session(app_name="workout_agent", user_id=USER_ID, session_id=sub_session_id)
-    runner = Runner(agent=workout_agent, app_name="workout_agent", session_service=session_service)
-    
-    content = types.Content(role='user', parts=[types.Part(text=query)])
-    events = runner.run_async(user_id=USER_ID, session_id=sub_session_id, new_message=content)
-    
-    response_text = ""
-    async for event in events:
-        if event.is_final_response():
-            response_text = event.content.parts[0].text
-            
-    return response_text
+    return await _delegate("workout_agent", "workout", query)
 
 async def ask_finance_agent(query: str) -> str:
     """Delegates a request to analyze financial portfolios or answer finance questions to the finance agent.
@@ -107,22 +175,10 @@ async def ask_finance_agent(query: str) -> str:
     Args:
         query: The user's request regarding finance or portfolio analysis.
     """
-    session_service = InMemorySessionService()
-    sub_session_id = f"{SESSION_ID}_finance"
-    
-    await session_service.create_session(app_name="finance_agent", user_id=USER_ID, session_id=sub_session_id)
-    runner = Runner(agent=finance_agent, app_name="finance_agent", session_service=session_service)
-    
-    content = types.Content(role='user', parts=[types.Part(text=query)])
-    events = runner.run_async(user_id=USER_ID, session_id=sub_session_id, new_message=content)
-    
-    response_text = "The finance agent did not return any content."
-    async for event in events:
-        if event.is_final_response():
-            if event.content and event.content.parts:
-                response_text = event.content.parts[0].text
-            
-    return response_text
+    return await _delegate(
+        "finance_agent", "finance", query,
+        empty_response="The finance agent did not return any content.",
+    )
 
 async def ask_movie_agent(query: str) -> str:
     """Delegates a request to recommend movies, manage watchlist, or save preferences to the movie agent.
@@ -130,25 +186,11 @@ async def ask_movie_agent(query: str) -> str:
     Args:
         query: The user's request regarding movies.
     """
-    session_service = InMemorySessionService()
-    sub_session_id = f"{SESSION_ID}_movie"
-    
-    await session_service.create_session(app_name="movie_agent", user_id=USER_ID, session_id=sub_session_id)
-    runner = Runner(agent=movie_agent, app_name="movie_agent", session_service=session_service)
-    
-    content = types.Content(role='user', parts=[types.Part(text=query)])
-    events = runner.run_async(user_id=USER_ID, session_id=sub_session_id, new_message=content)
-    
-    response_text = ""
-    async for event in events:
-        if event.is_final_response():
-            response_text = event.content.parts[0].text
-            
-    return response_text
+    return await _delegate("movie_agent", "movie", query)
 
 root_agent = Agent(
     name="orchestrator_agent",
-    model="gemini-2.5-flash",
+    model=MODEL,
     description="Orchestrator agent that routes user queries to specialized agents.",
     instruction="""
     You are an intelligent orchestrator. Your job is to understand the user's request and route it to the most appropriate specialized agent.
@@ -171,7 +213,10 @@ root_agent = Agent(
     -   Pass the user's query exactly as is (or slightly refined for clarity) to the sub-agent.
     -   Return the response from the sub-agent to the user.
     """,
-    tools=[ask_search_agent, ask_band_tour_agent, ask_workout_agent, ask_finance_agent, ask_movie_agent]
+    tools=[ask_search_agent, ask_band_tour_agent, ask_workout_agent, ask_finance_agent, ask_movie_agent],
+    # Starts the turn deadline that every delegated call inherits.
+    before_agent_callback=begin_turn,
+    after_tool_callback=record_tool_usage,
 )
 
 # Session and Runner
@@ -195,6 +240,42 @@ async def call_agent_async(query):
             else:
                  print("Orchestrator Response: (No content returned)")
 
+async def run_query(query: str, user_id: str = USER_ID) -> str:
+    """Runs one query through the orchestrator on the shared runner, in a fresh session.
+
+    Used for non-interactive callers (e.g. batch.py) so that many queries share
+    the same runners, model connections and caches.
+
+    Returns:
+        The orchestrator's final response. It is a `DegradedAnswer` if any
+        sub-agent call was served a cached or error answer instead.
+
+    Raises:
+        RuntimeError: If the orchestrator returned no response text.
+    """
+    runner = get_runner(APP_NAME)
+    session_id = f"{SESSION_ID}_{uuid.uuid4().hex}"
+    await _session_service.create_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+
+    try:
+        content = types.Content(role='user', parts=[types.Part(text=query)])
+        events = runner.run_async(user_id=user_id, session_id=session_id, new_message=content)
+
+        response_text = ""
+        with track_degraded() as degraded:
+            async for event in events:
+                if event.is_final_response():
+                    if event.content and event.content.parts:
+                        response_text = event.content.parts[0].text or ""
+    finally:
+        await _session_service.delete_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+
+    if not response_text.strip():
+        raise RuntimeError("The orchestrator returned an empty response.")
+    if degraded:
+        return DegradedAnswer(response_text, "; ".join(degraded))
+    return response_text
+
 if __name__ == "__main__":
     # Example usage
     asyncio.run(call_agent_async("Find me a concert for Radiohead near 90210"))
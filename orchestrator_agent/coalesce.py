@@ -0,0 +1,98 @@
+"""Request coalescing (single-flight) for identical in-flight sub-agent queries.
+
+When many users send the same query at once (a tour announcement, a market
+event), only the first caller runs the upstream model + search chain; every
+concurrent caller with the same key awaits that one execution and receives
+its result. Nothing is cached once the execution finishes — that is the job
+of the resilience layer's fallback cache.
+
+The shared execution does not inherit the first caller's turn deadline. Each
+caller waits until its own deadline, and the execution is cancelled once no
+caller is left waiting, so it runs at most as long as the latest deadline
+among its callers.
+
+tests/test_coalesce.py covers bursts of identical queries.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable
+
+from orchestrator_agent.resilience import DeadlineExceeded, spawn_detached, time_remaining
+
+
+def coalesce_key(agent: str, query: str, *context) -> tuple:
+    """Builds a single-flight key from the agent, the normalized query and any context the answer depends on.
+
+    Args:
+        agent: The sub-agent's app name.
+        query: The raw query; case and whitespace are normalized away.
+        *context: Extra values that change the answer (e.g. the date).
+    """
+    return (agent, " ".join(query.lower().split()), *context)
+
+
+class SingleFlight:
+    """Shares one execution between concurrent calls with the same key."""
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.stats: Dict[str, int] = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+            "deadline_exceeded": 0,
+            "abandoned": 0,
+        }
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """Runs `fn` unless an identical call is already in flight, in which case its result is shared.
+
+        The execution runs in its own task, so a caller being cancelled or
+        running out of turn time does not cancel the work other callers are
+        waiting on.
+
+        Args:
+            key: Hashable key identifying identical requests.
+            fn: Zero-argument coroutine factory performing the upstream call.
+
+        Raises:
+            DeadlineExceeded: If the caller's turn deadline expires first.
+        """
+        self.stats["calls"] += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.stats["executions"] += 1
+            task = spawn_detached(fn)
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.stats["coalesced"] += 1
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            done, _ = await asyncio.wait({task}, timeout=max(time_remaining(), 0))
+            if not done:
+                self.stats["deadline_exceeded"] += 1
+                raise DeadlineExceeded("The turn deadline expired while waiting for a shared call.")
+            return task.result()
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    # Nobody is left to receive the answer.
+                    self.stats["abandoned"] += 1
+                    self._finished(key, task)
+                    task.cancel()
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.done() and not task.cancelled():
+            # Mark the error retrieved even if every caller already gave up.
+            task.exception()
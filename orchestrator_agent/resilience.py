@@ -0,0 +1,409 @@
+"""Resilience helpers for the orchestrator's sub-agent and tool calls.
+
+An orchestrator turn gets a deadline that every delegated call inherits.
+Each upstream (a sub-agent and the model/search chain behind it) is wrapped
+in an `Upstream` policy which applies per-attempt timeouts, jittered retries
+for idempotent calls, hedged duplicate requests once an attempt runs past the
+observed p95 latency, and a circuit breaker that short-circuits to the last
+good cached answer while the upstream is failing. Fallback answers are
+`DegradedAnswer` strings, and `track_degraded()` collects the ones served
+during a turn so non-interactive callers can tell them from real answers.
+
+tests/test_resilience.py exercises the policies against a local
+fault-injecting stub.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import os
+import random
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional
+
+DEFAULT_TURN_TIMEOUT = float(os.getenv("MAESTRO_TURN_TIMEOUT", "120"))
+
+_turn_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "maestro_turn_deadline", default=None
+)
+_degraded: contextvars.ContextVar[Optional[List[str]]] = contextvars.ContextVar(
+    "maestro_degraded", default=None
+)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the orchestrator turn has no time left for another call."""
+
+
+class UpstreamTimeout(Exception):
+    """Raised when a single attempt against an upstream times out."""
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited by an open circuit breaker."""
+
+
+class DegradedAnswer(str):
+    """A cached or error answer served in place of the upstream's own.
+
+    Attributes:
+        reason: Why the upstream's answer was not available.
+    """
+
+    def __new__(cls, text: str, reason: str = ""):
+        answer = super().__new__(cls, text)
+        answer.reason = reason
+        return answer
+
+
+@contextlib.contextmanager
+def track_degraded():
+    """Collects the reasons of every degraded answer noted within the block (and tasks it spawns)."""
+    reasons: List[str] = []
+    token = _degraded.set(reasons)
+    try:
+        yield reasons
+    finally:
+        _degraded.reset(token)
+
+
+def note_degraded(reason: str) -> None:
+    """Records a degraded answer for the enclosing `track_degraded()` block, if any."""
+    reasons = _degraded.get()
+    if reasons is not None:
+        reasons.append(reason)
+
+
+def begin_turn(callback_context=None, timeout: Optional[float] = None) -> None:
+    """Starts the deadline for a new orchestrator turn.
+
+    Usable directly as a `before_agent_callback`: the deadline is stored in a
+    context variable, so every tool call made during the turn (including
+    parallel calls and tasks spawned from it) sees the same deadline.
+
+    Args:
+        callback_context: The ADK callback context (unused).
+        timeout: Turn budget in seconds. Defaults to `MAESTRO_TURN_TIMEOUT`.
+    """
+    seconds = DEFAULT_TURN_TIMEOUT if timeout is None else timeout
+    _turn_deadline.set(time.monotonic() + seconds)
+    return None
+
+
+@contextlib.contextmanager
+def turn_deadline(timeout: Optional[float] = None):
+    """Scopes a deadline to a block. A nested deadline never extends an outer one."""
+    seconds = DEFAULT_TURN_TIMEOUT if timeout is None else timeout
+    deadline = time.monotonic() + seconds
+    outer = _turn_deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _turn_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _turn_deadline.reset(token)
+
+
+def time_remaining() -> float:
+    """Returns the seconds left in the current turn (the default budget if none is set)."""
+    deadline = _turn_deadline.get()
+    if deadline is None:
+        return DEFAULT_TURN_TIMEOUT
+    return deadline - time.monotonic()
+
+
+def spawn_detached(fn: Callable[[], Awaitable]) -> asyncio.Task:
+    """Starts `fn()` in a task that does not inherit the current turn deadline.
+
+    For work shared between turns: it runs with the default budget, and each
+    caller bounds its own wait by its own deadline.
+    """
+    context = contextvars.copy_context()
+    context.run(_turn_deadline.set, None)
+    return context.run(asyncio.ensure_future, fn())
+
+
+async def retry_async(
+    fn: Callable[[], Awaitable],
+    attempts: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 5.0,
+    should_retry: Optional[Callable[[], bool]] = None,
+):
+    """Calls `fn` up to `attempts` times with full-jitter exponential backoff.
+
+    Only use this for idempotent calls. Deadline expiry and cancellation are
+    never retried, and no retry is scheduled if its backoff would outlive the
+    turn deadline.
+
+    Args:
+        fn: Zero-argument coroutine factory to call.
+        attempts: Maximum number of attempts.
+        base_delay: Backoff cap for the first retry, doubled on each retry.
+        max_delay: Upper bound on any single backoff.
+        should_retry: Optional predicate checked before each retry.
+    """
+    for attempt in range(attempts):
+        try:
+            return await fn()
+        except (DeadlineExceeded, CircuitOpenError):
+            raise
+        except Exception:
+            if attempt == attempts - 1:
+                raise
+            if should_retry is not None and not should_retry():
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            if delay >= time_remaining():
+                raise
+            await asyncio.sleep(delay)
+
+
+async def hedged(fn: Callable[[], Awaitable], hedge_after: float, on_hedge=None):
+    """Runs `fn`, starting a duplicate if the first call is still running after `hedge_after` seconds.
+
+    The first successful result wins and the other call is cancelled. If both
+    fail, the last error is raised.
+
+    Args:
+        fn: Zero-argument coroutine factory to call.
+        hedge_after: Seconds to wait before sending the duplicate request.
+        on_hedge: Optional callback invoked when the duplicate is sent.
+    """
+    pending = {asyncio.ensure_future(fn())}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_after)
+        if done:
+            return done.pop().result()
+        if on_hedge is not None:
+            on_hedge()
+        pending.add(asyncio.ensure_future(fn()))
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Returns the p-th percentile (0-1), or None until enough samples are collected."""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker for a single upstream."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """Returns whether a call may go through right now."""
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = "half_open"
+            self._probe_in_flight = False
+        if self.state == "half_open":
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def release(self) -> None:
+        """Frees the half-open probe slot after a probe that ended without a verdict.
+
+        A probe that is cancelled or runs out of turn time says nothing about
+        the upstream, but must not keep the slot, or the circuit never closes.
+        """
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+class FallbackCache:
+    """Small LRU of the last good answer per key, served while an upstream is failing."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: str) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class Upstream:
+    """Resilience policy for one upstream.
+
+    Args:
+        name: Human-readable name, used in fallback messages.
+        timeout: Per-attempt timeout in seconds (capped by the turn deadline).
+        attempts: Total attempts. Keep at 1 for calls with side effects.
+        base_delay: Backoff cap for the first retry in seconds.
+        hedge: Whether to send a duplicate request once an attempt exceeds the observed p95.
+        failure_threshold: Consecutive failures that open the circuit.
+        reset_timeout: Seconds the circuit stays open before a half-open probe.
+        cache_size: Entries kept for cached fallback answers; 0 disables the fallback cache.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float = 60.0,
+        attempts: int = 1,
+        base_delay: float = 0.5,
+        hedge: bool = False,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        cache_size: int = 256,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.hedge = hedge
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latency = LatencyTracker()
+        self.cache = FallbackCache(cache_size)
+        self.stats: Dict[str, int] = {
+            "calls": 0,
+            "attempts": 0,
+            "hedges": 0,
+            "failures": 0,
+            "short_circuits": 0,
+            "fallbacks": 0,
+        }
+
+    async def call(self, key: Hashable, fn: Callable[[], Awaitable[str]]) -> str:
+        """Runs `fn` under this policy, falling back to a cached or error answer on failure.
+
+        Args:
+            key: Hashable request key for the fallback cache (e.g. from `coalesce_key`).
+            fn: Zero-argument coroutine factory performing one upstream call.
+
+        Returns:
+            The upstream answer, or a `DegradedAnswer` (cached answer or error message).
+        """
+        self.stats["calls"] += 1
+        if not self.breaker.allow():
+            self.stats["short_circuits"] += 1
+            return self._fallback(key, CircuitOpenError(f"{self.name} circuit is open"))
+        try:
+            result = await retry_async(
+                lambda: self._attempt(fn),
+                attempts=self.attempts,
+                base_delay=self.base_delay,
+                should_retry=self.breaker.allow,
+            )
+        except Exception as e:
+            return self._fallback(key, e)
+        self.cache.put(key, result)
+        return result
+
+    async def _once(self, fn: Callable[[], Awaitable[str]]) -> str:
+        # The timeout is taken from the turn deadline when this attempt starts,
+        # so a hedged duplicate sent later never outlives the turn.
+        remaining = time_remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"No time left in this turn to call the {self.name}.")
+        timeout = min(self.timeout, remaining)
+        self.stats["attempts"] += 1
+        try:
+            return await asyncio.wait_for(fn(), timeout)
+        except asyncio.TimeoutError:
+            if timeout < self.timeout:
+                raise DeadlineExceeded(f"The turn deadline expired while waiting for the {self.name}.")
+            raise UpstreamTimeout(f"The {self.name} did not respond within {timeout:.0f}s.")
+
+    async def _attempt(self, fn: Callable[[], Awaitable[str]]) -> str:
+        hedge_after = self.latency.percentile(0.95) if self.hedge else None
+        start = time.monotonic()
+        try:
+            if hedge_after is not None and hedge_after < min(self.timeout, time_remaining()):
+                result = await hedged(lambda: self._once(fn), hedge_after, on_hedge=self._count_hedge)
+            else:
+                result = await self._once(fn)
+        except DeadlineExceeded:
+            # The turn ran out of time, possibly on other calls: not the upstream's fault.
+            self.breaker.release()
+            raise
+        except Exception:
+            self._record_failure()
+            raise
+        except BaseException:
+            # Cancelled (client disconnect, worker drain).
+            self.breaker.release()
+            raise
+        self.latency.record(time.monotonic() - start)
+        self.breaker.record_success()
+        return result
+
+    def _count_hedge(self) -> None:
+        self.stats["hedges"] += 1
+
+    def _record_failure(self) -> None:
+        self.stats["failures"] += 1
+        self.breaker.record_failure()
+
+    def _fallback(self, key: Hashable, error: Exception) -> DegradedAnswer:
+        reason = f"{self.name}: {error}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats["fallbacks"] += 1
+            return DegradedAnswer(f"(Cached answer: the {self.name} is currently unavailable.)\n\n{cached}", reason)
+        return DegradedAnswer(
+            f"Error: the {self.name} is temporarily unavailable ({error}). Please try again shortly.", reason
+        )
+
@@ -0,0 +1,145 @@
+"""Startup warm-up so the first request after a deploy does not pay cold-start costs.
+
+`warm_up()` imports every agent, pre-builds the orchestrator's own Runners
+(the ones `run_query` and the delegation tools use), opens the Gemini API
+connection of every distinct model instance and primes the file-backed tool
+caches, recording how long each phase took. The server only reports ready
+once it has finished. The ADK web server keeps its own per-app Runners, which
+it still creates on the first /run or /run_sse for each app; that costs little
+once the agents are imported and the connections are open. `keep_alive()` then re-touches
+the model connections periodically so idle pods do not lose them.
+
+Configuration (environment variables):
+    MAESTRO_WARMUP: set to 0 to skip warm-up entirely.
+    MAESTRO_WARMUP_CONNECT: set to 0 to skip opening model connections.
+    MAESTRO_WARMUP_TIMEOUT: seconds each phase (and each keep-alive ping) may
+        take before it is abandoned, so a hanging upstream cannot keep the
+        worker from binding its port.
+    MAESTRO_KEEPALIVE_INTERVAL: seconds between keep-alive pings (0 disables).
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import time
+from typing import Dict, List
+
+WARMUP_ENABLED = os.getenv("MAESTRO_WARMUP", "1") != "0"
+WARMUP_CONNECT = os.getenv("MAESTRO_WARMUP_CONNECT", "1") != "0"
+WARMUP_TIMEOUT = float(os.getenv("MAESTRO_WARMUP_TIMEOUT", "10"))
+KEEPALIVE_INTERVAL = float(os.getenv("MAESTRO_KEEPALIVE_INTERVAL", "30"))
+
+AGENT_MODULES = [
+    "search_agent.agent",
+    "band_tour_agent.agent",
+    "workout_agent.agent",
+    "finance_agent.agent",
+    "movie_agent.agent",
+    "orchestrator_agent.agent",
+]
+
+logger = logging.getLogger("maestro.warmup")
+
+
+def _models() -> List:
+    """Returns every distinct model instance used by the agents and their sub-agents."""
+    from orchestrator_agent.agent import SUB_AGENTS, root_agent
+
+    models, seen, stack = [], set(), [root_agent, *SUB_AGENTS.values()]
+    while stack:
+        agent = stack.pop()
+        model = getattr(agent, "model", None)
+        if model is not None and not isinstance(model, str) and id(model) not in seen:
+            seen.add(id(model))
+            models.append(model)
+        stack.extend(agent.sub_agents)
+        for tool in getattr(agent, "tools", []):
+            if hasattr(tool, "agent"):
+                stack.append(tool.agent)
+    return models
+
+
+async def _ping(model, timeout: float = WARMUP_TIMEOUT) -> None:
+    # Fetching model metadata opens (or reuses) the pooled HTTPS connection
+    # without spending any tokens.
+    await asyncio.wait_for(model.api_client.aio.models.get(model=model.model), timeout)
+
+
+def _prime_tool_caches() -> None:
+    from band_tour_agent.similarity import get_index as get_artist_index
+    from movie_agent.recommender import get_index as get_movie_index
+    from movie_agent.tools import get_preferences
+    from workout_agent.tools import list_workouts
+
+    get_preferences()
+    list_workouts()
+    get_artist_index()
+    get_movie_index()
+
+
+async def warm_up() -> Dict[str, float]:
+    """Runs the warm-up phases and returns their durations in milliseconds."""
+    timings: Dict[str, float] = {}
+    if not WARMUP_ENABLED:
+        return timings
+
+    async def phase(name, fn):
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(fn(), WARMUP_TIMEOUT)
+        except asyncio.TimeoutError:
+            # A phase stuck on a slow upstream is abandoned (a thread it started
+            # runs on in the background) so startup still finishes.
+            logger.warning("Warm-up phase '%s' timed out after %gs", name, WARMUP_TIMEOUT)
+        except Exception as e:
+            # A failed phase only costs latency later; it must not block readiness.
+            logger.warning("Warm-up phase '%s' failed: %s", name, e)
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    async def imports():
+        for module_name in AGENT_MODULES:
+            await asyncio.to_thread(importlib.import_module, module_name)
+
+    def build_runners():
+        from orchestrator_agent.agent import APP_NAME, SUB_AGENTS, get_runner
+
+        for app_name in [APP_NAME, *SUB_AGENTS]:
+            get_runner(app_name)
+
+    async def runners():
+        # In a thread, like every blocking phase, so the phase timeout can abandon it.
+        await asyncio.to_thread(build_runners)
+
+    async def connections():
+        if not WARMUP_CONNECT:
+            return
+        await asyncio.gather(*(_ping(model) for model in _models()))
+
+    async def tool_caches():
+        await asyncio.to_thread(_prime_tool_caches)
+
+    await phase("imports", imports)
+    await phase("runners", runners)
+    await phase("connections", connections)
+    await phase("tool_caches", tool_caches)
+    timings["total"] = round(sum(timings.values()), 1)
+    logger.info("Warm-up finished: %s", timings)
+    return timings
+
+
+async def keep_alive(interval: float = KEEPALIVE_INTERVAL) -> None:
+    """Pings every model connection every `interval` seconds until cancelled."""
+    if interval <= 0 or not WARMUP_CONNECT:
+        return
+    while True:
+        await asyncio.sleep(interval)
+        results = await asyncio.gather(*(_ping(model) for model in _models()), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.debug("Keep-alive ping failed: %s", result)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(asyncio.run(warm_up()))
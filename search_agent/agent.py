@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from google.adk.agents import Agent
+from google.adk.models import Gemini
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.adk.tools import google_search
@@ -26,10 +27,11 @@ APP_NAME="google_search_agent"
 USER_ID="user1234"
 SESSION_ID="1234"
 
+MODEL = Gemini(model="gemini-2.5-flash")
 
 root_agent = Agent(
     name="search_agent",
-    model="gemini-2.5-flash",
+    model=MODEL,
     description="Agent to answer questions using Google Search.",
     instruction="""
     You are a helpful assistant with access to Google Search.
@@ -0,0 +1,232 @@
+"""Production ASGI entry point for the Maestro backend.
+
+`adk web` runs a single process, so one core and one GIL serve every user.
+This module wraps the same ADK FastAPI app in an app factory that can run
+under several uvicorn workers:
+
+    python server.py                      # MAESTRO_WORKERS workers on port 8000
+    uvicorn server:create_app --factory --workers 4 --port 8000
+
+Each worker runs the warm-up in orchestrator_agent/warmup.py before it
+reports ready on /readyz. Workers share sessions through
+MAESTRO_SESSION_SERVICE_URI (SQLite by default; point it at Postgres when
+running several pods; `memory://` selects the memory-bounded in-memory store
+registered in services.py). On SIGTERM a worker stops reporting ready and drains
+in-flight SSE streams for up to MAESTRO_DRAIN_TIMEOUT seconds before exiting.
+
+The Maestro diagnostics (/debug/tool_usage, /debug/coalescing, /debug/memory)
+are unauthenticated, so they are only registered with MAESTRO_DEBUG_ENDPOINTS=1;
+keep them off publicly reachable deployments.
+"""
+
+import asyncio
+import contextlib
+import logging
+import math
+import os
+import signal
+import threading
+import time
+from typing import Optional
+
+import uvicorn
+from dotenv import load_dotenv
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from google.adk.cli.fast_api import get_fast_api_app
+
+from maestro_common.session_store import memory_report
+from maestro_common.tool_budget import tool_usage_report
+
+load_dotenv()
+
+AGENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+HOST = os.getenv("MAESTRO_HOST", "0.0.0.0")
+PORT = int(os.getenv("MAESTRO_PORT", "8000"))
+DEFAULT_WORKERS = 2
+SESSION_SERVICE_URI = os.getenv("MAESTRO_SESSION_SERVICE_URI", "sqlite:///maestro_sessions.db")
+DRAIN_TIMEOUT = float(os.getenv("MAESTRO_DRAIN_TIMEOUT", "60"))
+ALLOW_ORIGINS = [o for o in os.getenv("MAESTRO_ALLOW_ORIGINS", "").split(",") if o]
+DEBUG_ENDPOINTS = os.getenv("MAESTRO_DEBUG_ENDPOINTS", "0") == "1"
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+logger = logging.getLogger("maestro.server")
+
+
+def _cgroup_cpu_limit(root: str = CGROUP_ROOT) -> Optional[int]:
+    """Returns the container's CPU quota rounded up to whole CPUs, or None if there is none.
+
+    `os.cpu_count()` reports the host's CPUs inside a container, not the quota.
+    """
+    try:
+        with open(os.path.join(root, "cpu.max")) as f:  # cgroup v2: "<quota> <period>" or "max <period>"
+            quota, period = f.read().split()[:2]
+    except (OSError, ValueError):
+        try:  # cgroup v1
+            with open(os.path.join(root, "cpu", "cpu.cfs_quota_us")) as f:
+                quota = f.read().strip()
+            with open(os.path.join(root, "cpu", "cpu.cfs_period_us")) as f:
+                period = f.read().strip()
+        except OSError:
+            return None
+    if quota in ("max", "-1"):
+        return None
+    try:
+        return max(1, math.ceil(int(quota) / int(period)))
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def default_workers() -> int:
+    """One worker per CPU of the container's CPU quota, or DEFAULT_WORKERS without a quota."""
+    return _cgroup_cpu_limit(CGROUP_ROOT) or DEFAULT_WORKERS
+
+
+WORKERS = int(os.getenv("MAESTRO_WORKERS") or default_workers())
+
+
+class ServingState:
+    """Per-worker readiness and in-flight request tracking."""
+
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+        self.in_flight = 0
+        self.warmup = {}
+
+
+class InFlightMiddleware:
+    """Counts requests until their (possibly streaming) response completes.
+
+    New agent runs are refused with 503 once the worker is draining, so a
+    load balancer retries them on a healthy worker.
+    """
+
+    def __init__(self, app, state: ServingState):
+        self.app = app
+        self.state = state
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        if self.state.draining and scope["path"] in ("/run", "/run_sse"):
+            response = JSONResponse({"detail": "Server is shutting down"}, status_code=503)
+            return await response(scope, receive, send)
+        self.state.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.state.in_flight -= 1
+
+
+def _watch_shutdown_signals(state: ServingState) -> None:
+    """Flips the worker to draining as soon as uvicorn receives SIGTERM/SIGINT."""
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        previous = signal.getsignal(sig)
+
+        def handler(signum, frame, previous=previous):
+            state.draining = True
+            if callable(previous):
+                previous(signum, frame)
+
+        signal.signal(sig, handler)
+
+
+async def _drain(state: ServingState) -> None:
+    deadline = time.monotonic() + DRAIN_TIMEOUT
+    while state.in_flight > 0 and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+    if state.in_flight:
+        logger.warning("Drain timeout reached with %d requests still in flight.", state.in_flight)
+
+
+def create_app() -> FastAPI:
+    """Builds the ADK FastAPI app with readiness probes and graceful draining."""
+    state = ServingState()
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: FastAPI):
+        from orchestrator_agent.warmup import keep_alive, warm_up
+
+        _watch_shutdown_signals(state)
+        state.warmup = await warm_up()
+        state.ready = True
+        logger.info("Worker %d ready (warm-up ms: %s)", os.getpid(), state.warmup)
+        keep_alive_task = asyncio.create_task(keep_alive())
+        yield
+        state.ready = False
+        state.draining = True
+        await _drain(state)
+        keep_alive_task.cancel()
+
+    app = get_fast_api_app(
+        agents_dir=AGENTS_DIR,
+        session_service_uri=SESSION_SERVICE_URI,
+        allow_origins=ALLOW_ORIGINS or None,
+        web=False,
+        host=HOST,
+        port=PORT,
+        lifespan=lifespan,
+    )
+
+    @app.get("/healthz")
+    async def healthz():
+        return {"status": "ok"}
+
+    @app.get("/readyz")
+    async def readyz():
+        body = {
+            "ready": state.ready and not state.draining,
+            "draining": state.draining,
+            "in_flight": state.in_flight,
+            "warmup_ms": state.warmup,
+            "pid": os.getpid(),
+        }
+        return JSONResponse(body, status_code=200 if body["ready"] else 503)
+
+    if DEBUG_ENDPOINTS:
+        _add_debug_routes(app)
+
+    app.add_middleware(InFlightMiddleware, state=state)
+    app.state.serving = state
+    return app
+
+
+def _add_debug_routes(app: FastAPI) -> None:
+    """Registers the per-worker diagnostics under /debug."""
+
+    @app.get("/debug/tool_usage")
+    async def tool_usage(last_turns: int = 20):
+        """Estimated tokens returned by each tool, per agent turn, in this worker."""
+        return tool_usage_report(last_turns)
+
+    @app.get("/debug/coalescing")
+    async def coalescing():
+        """Single-flight counters for identical sub-agent queries, in this worker."""
+        from orchestrator_agent.agent import SINGLE_FLIGHT
+
+        return {**SINGLE_FLIGHT.stats, "in_flight": SINGLE_FLIGHT.in_flight}
+
+    @app.get("/debug/memory")
+    async def memory(top: int = 10, trace: Optional[bool] = None):
+        """Memory held by in-memory sessions per session and agent, plus tracemalloc stats, in this worker.
+
+        `trace=true` starts tracemalloc and `trace=false` stops it.
+        """
+        # Walking every stored event takes a while with many sessions; keep it off the event loop.
+        return await asyncio.to_thread(memory_report, top, trace)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    uvicorn.run(
+        "server:create_app",
+        factory=True,
+        host=HOST,
+        port=PORT,
+        workers=WORKERS,
+        timeout_graceful_shutdown=int(DRAIN_TIMEOUT),
+    )
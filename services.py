@@ -0,0 +1,20 @@
+"""Custom ADK service registrations.
+
+ADK imports this module from the agents directory when it builds the app
+(`adk web .`, `adk api_server .` and server.py), so `memory://` session URIs
+get the memory-bounded session store from maestro_common/session_store.py
+instead of the unbounded `InMemorySessionService`:
+
+    adk web . --session_service_uri "memory://?max_events=200&max_bytes=2097152"
+"""
+
+from google.adk.cli.service_registry import get_service_registry
+
+from maestro_common.session_store import BoundedInMemorySessionService
+
+
+def bounded_memory_session_factory(uri: str, **kwargs):
+    return BoundedInMemorySessionService.from_uri(uri)
+
+
+get_service_registry().register_session_service("memory", bounded_memory_session_factory)
@@ -0,0 +1,40 @@
+import asyncio
+import json
+
+import pytest
+
+import batch
+from orchestrator_agent.resilience import DegradedAnswer
+
+
+def _write_lines(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_load_queries_assigns_ids_and_rejects_bad_lines(tmp_path):
+    path = _write_lines(tmp_path / "in.jsonl", ['{"query": "a"}', "", '{"id": "x", "query": "b"}'])
+    assert [item["id"] for item in batch.load_queries(path)] == ["1", "x"]
+
+    for bad in ['{"id": "x"}', '{"query": "  "}', '["query"]', "{not json"]:
+        with pytest.raises(ValueError, match=r"in\.jsonl:2"):
+            batch.load_queries(_write_lines(tmp_path / "in.jsonl", ['{"query": "a"}', bad]))
+
+
+def test_degraded_and_empty_answers_are_retried_on_resume(tmp_path, monkeypatch):
+    async def fake_run_query(query, user_id=None):
+        if query == "cached":
+            return DegradedAnswer("(Cached answer: ...)", "search agent: circuit is open")
+        if query == "empty":
+            raise RuntimeError("The orchestrator returned an empty response.")
+        return "fresh answer"
+
+    monkeypatch.setattr(batch, "run_query", fake_run_query)
+    items = [{"id": q, "query": q} for q in ("fresh", "cached", "empty")]
+    output = str(tmp_path / "out.jsonl")
+    asyncio.run(batch.run_batch(items, output, concurrency=2, rate=0))
+
+    with open(output, encoding="utf-8") as f:
+        statuses = {r["id"]: r["status"] for r in map(json.loads, f)}
+    assert statuses == {"fresh": "ok", "cached": "degraded", "empty": "error"}
+    assert batch.load_completed(output) == {"fresh"}
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from orchestrator_agent.coalesce import SingleFlight, coalesce_key
+from orchestrator_agent.resilience import DeadlineExceeded, time_remaining, turn_deadline
+
+
+def test_burst_of_identical_queries_runs_once():
+    flight = SingleFlight()
+    upstream_calls = 0
+
+    async def slow_upstream():
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(0.1)
+        return "tour dates"
+
+    queries = ["Radiohead tour dates 90210", "radiohead  TOUR dates 90210"] * 50
+
+    async def run():
+        results = await asyncio.gather(
+            *(flight.do(coalesce_key("band_tour_agent", q), slow_upstream) for q in queries)
+        )
+        assert flight.in_flight == 0
+        # Once the first execution finishes, the next call runs again.
+        await flight.do(coalesce_key("band_tour_agent", queries[0]), slow_upstream)
+        return results
+
+    results = asyncio.run(run())
+    assert set(results) == {"tour dates"}
+    assert upstream_calls == 2
+    assert flight.stats == {"calls": 101, "executions": 2, "coalesced": 99, "deadline_exceeded": 0, "abandoned": 0}
+
+
+def test_cancelled_caller_does_not_cancel_shared_execution():
+    flight = SingleFlight()
+
+    async def slow_upstream():
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("k", slow_upstream))
+        second = asyncio.ensure_future(flight.do("k", slow_upstream))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "answer"
+
+
+def test_follower_is_not_bound_by_the_leaders_deadline():
+    flight = SingleFlight()
+    budgets = []
+
+    async def slow_upstream():
+        budgets.append(time_remaining())
+        await asyncio.sleep(0.2)
+        return "answer"
+
+    async def call(timeout):
+        with turn_deadline(timeout):
+            return await flight.do("k", slow_upstream)
+
+    async def run():
+        leader = asyncio.ensure_future(call(0.05))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(call(1.0))
+        with pytest.raises(DeadlineExceeded):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == "answer"
+    assert budgets[0] > 1.0
+    assert flight.stats["deadline_exceeded"] == 1
+    assert flight.stats["abandoned"] == 0
+
+
+def test_execution_is_cancelled_once_every_caller_gave_up():
+    flight = SingleFlight()
+
+    async def run():
+        stopped = asyncio.Event()
+
+        async def slow_upstream():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                stopped.set()
+                raise
+
+        with turn_deadline(0.05):
+            with pytest.raises(DeadlineExceeded):
+                await flight.do("k", slow_upstream)
+        await asyncio.wait_for(stopped.wait(), 0.5)
+        assert flight.in_flight == 0
+
+    asyncio.run(run())
+    assert flight.stats["abandoned"] == 1
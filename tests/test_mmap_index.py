@@ -0,0 +1,72 @@
+import os
+import threading
+
+import numpy as np
+
+from maestro_common.mmap_index import LazyIndex, index_is_stale, load_index, save_index
+
+NAMES = ["a", "b"]
+
+
+def _version(n: int) -> dict:
+    return {"a": np.full(1000, n), "b": np.full(1000, n)}
+
+
+def test_rebuild_swaps_the_whole_index(tmp_path):
+    index_dir = str(tmp_path / "index")
+    save_index(_version(1), index_dir)
+    old = load_index(index_dir, NAMES)
+
+    save_index(_version(2), index_dir)
+    new = load_index(index_dir, NAMES)
+    assert int(new["a"][0]) == int(new["b"][0]) == 2
+    # A worker that mapped the previous version keeps reading it.
+    assert int(old["a"][0]) == int(old["b"][0]) == 1
+    assert len(os.listdir(tmp_path)) == 2  # the link and the current version
+
+
+def test_loaders_never_see_a_mix_of_versions(tmp_path):
+    index_dir = str(tmp_path / "index")
+    save_index(_version(0), index_dir)
+    stop = threading.Event()
+    mixed = []
+
+    def load_repeatedly():
+        while not stop.is_set():
+            arrays = load_index(index_dir, NAMES)
+            if int(arrays["a"][0]) != int(arrays["b"][0]):
+                mixed.append(arrays)
+
+    loader = threading.Thread(target=load_repeatedly)
+    loader.start()
+    for n in range(1, 30):
+        save_index(_version(n), index_dir)
+    stop.set()
+    loader.join()
+    assert not mixed
+
+
+def test_plain_directory_is_replaced(tmp_path):
+    index_dir = tmp_path / "index"
+    index_dir.mkdir()
+    save_index(_version(1), str(index_dir))
+    assert index_dir.is_symlink()
+    assert int(load_index(str(index_dir), NAMES)["b"][0]) == 1
+
+
+def test_lazy_index_builds_once_when_stale(tmp_path):
+    source = tmp_path / "source.csv"
+    source.write_text("x\n")
+    index_dir = str(tmp_path / "index")
+    builds = []
+
+    def build(source_file, target_dir):
+        builds.append(source_file)
+        save_index(_version(len(builds)), target_dir)
+        return 1
+
+    assert index_is_stale(index_dir, NAMES, str(source))
+    lazy = LazyIndex(lambda d: load_index(d, NAMES), build, NAMES, str(source), index_dir)
+    assert int(lazy.get()["a"][0]) == 1
+    assert lazy.get() is lazy.get() and len(builds) == 1
+    assert not index_is_stale(index_dir, NAMES, str(source))
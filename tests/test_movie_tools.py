@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from movie_agent import tools
+
+
+@pytest.fixture
+def preferences_file(tmp_path, monkeypatch):
+    path = tmp_path / "user_preferences.json"
+    monkeypatch.setattr(tools, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(tools, "PREFERENCES_FILE", str(path))
+    monkeypatch.setattr(tools, "LOCK_FILE", str(path) + ".lock")
+    monkeypatch.setattr(tools, "_preferences_cache", {"key": None, "data": {}})
+    return path
+
+
+def test_preferences_round_trip_keeps_a_long_watchlist(preferences_file):
+    watchlist = [f"A Fairly Long Movie Title Number {i}" for i in range(300)]
+    favorites = {"favorite_genres": ["Sci-Fi", "Thriller"], "favorite_actors": ["Tom Hardy"]}
+    preferences_file.write_text(json.dumps({**favorites, "watchlist": watchlist}))
+
+    prefs = tools.get_preferences()
+    assert prefs == {**favorites, "watchlist_count": 300}
+    prefs["favorite_genres"].append("Drama")
+    assert tools.save_preferences(prefs) == "Preferences saved successfully."
+
+    saved = json.loads(preferences_file.read_text())
+    assert saved["watchlist"] == watchlist
+    assert saved["favorite_genres"] == ["Sci-Fi", "Thriller", "Drama"]
+    assert "watchlist_count" not in saved
+
+
+def test_watchlist_pages_cover_every_title(preferences_file):
+    watchlist = [f"A Fairly Long Movie Title Number {i}" for i in range(300)]
+    preferences_file.write_text(json.dumps({"watchlist": watchlist}))
+
+    seen, offset = [], 0
+    while offset is not None:
+        page = tools.get_watchlist(offset=offset, limit=100)
+        assert "omitted" not in page
+        seen.extend(page["items"])
+        offset = page["next_offset"]
+    assert seen == watchlist
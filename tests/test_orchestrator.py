@@ -0,0 +1,37 @@
+import asyncio
+import datetime
+
+from orchestrator_agent import agent
+from orchestrator_agent.resilience import CircuitBreaker, FallbackCache
+
+
+class _Day(datetime.date):
+    current = datetime.date(2026, 1, 1)
+
+    @classmethod
+    def today(cls):
+        return cls.current
+
+
+def test_fallback_never_serves_an_answer_from_another_day(monkeypatch):
+    answers = iter(["Radiohead plays Friday."])
+
+    async def sub_agent(app_name, session_suffix, query, empty_response=""):
+        try:
+            return next(answers)
+        except StopIteration:
+            raise RuntimeError("upstream down") from None
+
+    monkeypatch.setattr(agent, "_run_sub_agent", sub_agent)
+    monkeypatch.setattr(agent, "date", _Day)
+    upstream = agent.UPSTREAMS["band_tour_agent"]
+    monkeypatch.setattr(upstream, "attempts", 1)
+    monkeypatch.setattr(upstream, "cache", FallbackCache())
+    monkeypatch.setattr(upstream, "breaker", CircuitBreaker())
+
+    assert asyncio.run(agent.ask_band_tour_agent("Radiohead tour dates")) == "Radiohead plays Friday."
+    # Same day, different spelling: the cached answer is a valid fallback.
+    assert asyncio.run(agent.ask_band_tour_agent("radiohead  TOUR dates")).startswith("(Cached answer")
+
+    monkeypatch.setattr(_Day, "current", datetime.date(2026, 1, 2))
+    assert asyncio.run(agent.ask_band_tour_agent("Radiohead tour dates")).startswith("Error:")
@@ -0,0 +1,79 @@
+import json
+
+from movie_agent import tools
+from movie_agent.recommender import MovieIndex, build_index
+
+CATALOG = """title,year,genres,cast,director,rating
+Mad Max: Fury Road,2015,Action|Adventure,Tom Hardy|Charlize Theron,George Miller,8.1
+Inception,2010,Action|Sci-Fi,Leonardo DiCaprio|Tom Hardy,Christopher Nolan,8.8
+The Dark Knight,2008,Action|Crime,Christian Bale|Heath Ledger,Christopher Nolan,9.0
+Locke,2013,Drama,Tom Hardy,Steven Knight,7.1
+Amelie,2001,Comedy|Romance,Audrey Tautou,Jean-Pierre Jeunet,8.3
+"""
+
+
+def _index(tmp_path) -> MovieIndex:
+    catalog = tmp_path / "catalog.csv"
+    catalog.write_text(CATALOG, encoding="utf-8")
+    count = build_index(str(catalog), str(tmp_path / "index"))
+    index = MovieIndex(str(tmp_path / "index"))
+    assert len(index) == count == 5
+    return index
+
+
+def _titles(movies):
+    return [m["title"] for m in movies]
+
+
+def test_top_k_is_ordered_by_score(tmp_path):
+    index = _index(tmp_path)
+    movies = index.recommend(genres=["Action"], actors=["Tom Hardy"], directors=["Christopher Nolan"], k=3)
+    # Inception matches all three, The Dark Knight two, Mad Max two but has no Nolan bonus.
+    assert _titles(movies) == ["Inception", "The Dark Knight", "Mad Max: Fury Road"]
+    assert [m["score"] for m in movies] == sorted((m["score"] for m in movies), reverse=True)
+    assert len(index.recommend(genres=["Action"], actors=[], directors=[], k=2)) == 2
+
+
+def test_matches_name_the_preferences_each_movie_meets(tmp_path):
+    movies = _index(tmp_path).recommend(genres=["action"], actors=["Tom Hardy"], directors=["Christopher Nolan"], k=1)
+    assert movies[0]["title"] == "Inception"
+    assert movies[0]["matches"] == ["Action", "Tom Hardy", "Christopher Nolan"]
+
+
+def test_watchlist_titles_are_excluded_whatever_their_case(tmp_path):
+    movies = _index(tmp_path).recommend(
+        genres=["Action"], actors=["Tom Hardy"], directors=[], exclude_titles=["inception", "MAD MAX: FURY ROAD"], k=5
+    )
+    assert "Inception" not in _titles(movies)
+    assert "Mad Max: Fury Road" not in _titles(movies)
+    assert _titles(movies)[0] == "Locke"
+
+
+def test_genre_filter(tmp_path):
+    index = _index(tmp_path)
+    movies = index.recommend(genres=[], actors=["Tom Hardy"], directors=[], k=5, genre="drama")
+    assert _titles(movies) == ["Locke"]
+    assert index.recommend(genres=["Action"], actors=[], directors=[], k=5, genre="Western") == []
+
+
+def test_case_variant_favorites_count_once(tmp_path):
+    index = _index(tmp_path)
+    once = index.recommend(genres=["Drama"], actors=["Tom Hardy"], directors=[], k=3)
+    twice = index.recommend(genres=["Drama", "drama"], actors=["Tom Hardy", "tom hardy"], directors=[], k=3)
+    assert twice == once
+    assert once[0]["title"] == "Locke"
+    assert once[0]["matches"] == ["Drama", "Tom Hardy"]
+
+
+def test_recommend_movies_fits_its_budget_at_the_cap(tmp_path, monkeypatch):
+    index = _index(tmp_path)
+    monkeypatch.setattr(tools, "get_index", lambda: index)
+    monkeypatch.setattr(
+        tools, "_load_preferences",
+        lambda: {"favorite_genres": ["Action", "Drama", "Comedy"], "favorite_actors": ["Tom Hardy"], "watchlist": []},
+    )
+    result = tools.recommend_movies(k=50)
+    assert "omitted" not in result
+    assert len(result["recommendations"]) == 5
+    assert all("score" not in m and len(m["matches"]) <= tools.MAX_MATCHES for m in result["recommendations"])
+    assert len(json.dumps(result)) <= tools.MAX_RECOMMENDATIONS * tools.RECOMMENDATION_CHARS
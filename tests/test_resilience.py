@@ -0,0 +1,160 @@
+import asyncio
+import random
+import time
+
+from orchestrator_agent.resilience import DegradedAnswer, Upstream, note_degraded, track_degraded, turn_deadline
+
+
+class FaultyStub:
+    """Fake upstream that fails, stalls, or answers slowly on demand."""
+
+    def __init__(self, fail_rate=0.0, stall_rate=0.0, latency=0.01, slow_latency=0.5, slow_rate=0.0):
+        self.fail_rate = fail_rate
+        self.stall_rate = stall_rate
+        self.latency = latency
+        self.slow_latency = slow_latency
+        self.slow_rate = slow_rate
+        self.calls = 0
+
+    async def __call__(self, query="q"):
+        self.calls += 1
+        roll = random.random()
+        if roll < self.fail_rate:
+            raise ConnectionError("injected failure")
+        if roll < self.fail_rate + self.stall_rate:
+            await asyncio.sleep(3600)
+        if roll < self.fail_rate + self.stall_rate + self.slow_rate:
+            await asyncio.sleep(self.slow_latency)
+        else:
+            await asyncio.sleep(self.latency)
+        return f"answer to {query}"
+
+
+def _open_circuit(upstream: Upstream, stub: FaultyStub) -> None:
+    async def run():
+        await upstream.call("q", stub)
+        stub.fail_rate = 1.0
+        for _ in range(upstream.breaker.failure_threshold):
+            await upstream.call("q", stub)
+
+    asyncio.run(run())
+    assert upstream.breaker.state == "open"
+
+
+def test_retries_mask_transient_failures():
+    random.seed(7)
+    stub = FaultyStub(fail_rate=0.2)
+    upstream = Upstream("stub", timeout=1, attempts=4, base_delay=0.01, failure_threshold=100)
+
+    async def run():
+        return [await upstream.call("q", stub) for _ in range(50)]
+
+    results = asyncio.run(run())
+    assert not any(r.startswith("Error:") for r in results), upstream.stats
+    assert upstream.stats["attempts"] > 50
+
+
+def test_hedging_sends_duplicate_for_slow_attempts():
+    random.seed(7)
+    stub = FaultyStub(slow_rate=0.04, slow_latency=0.5)
+    upstream = Upstream("stub", timeout=2, hedge=True, failure_threshold=100)
+
+    async def run():
+        for _ in range(100):
+            await upstream.call("q", stub)
+
+    asyncio.run(run())
+    assert upstream.stats["hedges"] > 0, upstream.stats
+
+
+def test_hedged_duplicate_does_not_outlive_turn_deadline():
+    stub = FaultyStub(stall_rate=1.0)
+    upstream = Upstream("stub", timeout=30, hedge=True)
+    for _ in range(upstream.latency.min_samples):
+        upstream.latency.record(0.2)
+
+    async def run():
+        with turn_deadline(0.3):
+            start = time.monotonic()
+            answer = await upstream.call("q", stub)
+            return answer, time.monotonic() - start
+
+    answer, elapsed = asyncio.run(run())
+    assert upstream.stats["hedges"] == 1
+    assert answer.startswith("Error:")
+    assert elapsed < 0.4, elapsed
+
+
+def test_stalled_attempt_is_bounded_by_turn_deadline_without_blaming_upstream():
+    stub = FaultyStub(stall_rate=1.0)
+    upstream = Upstream("stub", timeout=30, failure_threshold=1)
+
+    async def run():
+        with turn_deadline(0.2):
+            start = time.monotonic()
+            answer = await upstream.call("q", stub)
+            return answer, time.monotonic() - start
+
+    answer, elapsed = asyncio.run(run())
+    assert elapsed < 0.5 and answer.startswith("Error:"), answer
+    assert upstream.stats["failures"] == 0
+    assert upstream.breaker.state == "closed"
+
+
+def test_upstream_timeout_counts_as_failure():
+    stub = FaultyStub(stall_rate=1.0)
+    upstream = Upstream("stub", timeout=0.05, failure_threshold=1, reset_timeout=60)
+
+    answer = asyncio.run(upstream.call("q", stub))
+    assert answer.startswith("Error:")
+    assert upstream.breaker.state == "open"
+
+
+def test_open_circuit_serves_cached_answer():
+    stub = FaultyStub()
+    upstream = Upstream("stub", timeout=1, failure_threshold=3, reset_timeout=60)
+    _open_circuit(upstream, stub)
+
+    calls_before = stub.calls
+    answer = asyncio.run(upstream.call("q", stub))
+    assert stub.calls == calls_before
+    assert answer.startswith("(Cached answer")
+
+
+def test_cancelled_half_open_probe_releases_the_circuit():
+    stub = FaultyStub()
+    upstream = Upstream("stub", timeout=5, failure_threshold=1, reset_timeout=0.01)
+    _open_circuit(upstream, stub)
+    time.sleep(0.02)
+
+    async def run():
+        stub.fail_rate = 0.0
+        stub.stall_rate = 1.0
+        probe = asyncio.ensure_future(upstream.call("q", stub))
+        await asyncio.sleep(0.05)
+        assert upstream.breaker.state == "half_open"
+        probe.cancel()
+        try:
+            await probe
+        except asyncio.CancelledError:
+            pass
+
+        stub.stall_rate = 0.0
+        return await upstream.call("q", stub)
+
+    answer = asyncio.run(run())
+    assert answer == "answer to q"
+    assert upstream.breaker.state == "closed"
+
+
+def test_fallback_answers_are_marked_degraded():
+    stub = FaultyStub()
+    upstream = Upstream("stub", timeout=1, failure_threshold=3, reset_timeout=60)
+    _open_circuit(upstream, stub)
+
+    with track_degraded() as degraded:
+        answer = asyncio.run(upstream.call("q", stub))
+        note_degraded(answer.reason)
+    assert isinstance(answer, DegradedAnswer)
+    assert degraded == ["stub: stub circuit is open"]
+    note_degraded("outside any tracked block")
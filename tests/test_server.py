@@ -0,0 +1,73 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+
+
+def _cgroup_v2(tmp_path, cpu_max: str) -> str:
+    (tmp_path / "cpu.max").write_text(cpu_max)
+    return str(tmp_path)
+
+
+def _cgroup_v1(tmp_path, quota: str, period: str = "100000") -> str:
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text(quota + "\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text(period + "\n")
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "cpu_max, expected",
+    [("200000 100000\n", 2), ("150000 100000\n", 2), ("50000 100000\n", 1), ("max 100000\n", None)],
+)
+def test_cgroup_v2_quota(tmp_path, cpu_max, expected):
+    assert server._cgroup_cpu_limit(_cgroup_v2(tmp_path, cpu_max)) == expected
+
+
+@pytest.mark.parametrize("quota, expected", [("400000", 4), ("25000", 1), ("-1", None)])
+def test_cgroup_v1_quota(tmp_path, quota, expected):
+    assert server._cgroup_cpu_limit(_cgroup_v1(tmp_path, quota)) == expected
+
+
+def test_quota_sets_the_default_worker_count(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "CGROUP_ROOT", _cgroup_v2(tmp_path, "300000 100000"))
+    assert server.default_workers() == 3
+
+
+def test_no_cgroup_files_falls_back_to_the_default(tmp_path, monkeypatch):
+    assert server._cgroup_cpu_limit(str(tmp_path)) is None
+    monkeypatch.setattr(server, "CGROUP_ROOT", str(tmp_path))
+    assert server.default_workers() == server.DEFAULT_WORKERS
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(server, "SESSION_SERVICE_URI", "memory://")
+    app = server.create_app()
+    # Not used as a context manager, so the lifespan (warm-up, model pings) never runs.
+    return TestClient(app), app.state.serving
+
+
+def test_probes_follow_readiness_and_draining(client):
+    client, state = client
+    assert client.get("/healthz").json() == {"status": "ok"}
+    assert client.get("/readyz").status_code == 503
+
+    state.ready = True
+    ready = client.get("/readyz")
+    assert ready.status_code == 200 and ready.json()["ready"] is True
+
+    state.draining = True
+    draining = client.get("/readyz")
+    assert draining.status_code == 503 and draining.json()["draining"] is True
+    assert client.get("/healthz").status_code == 200
+
+
+def test_new_runs_are_refused_while_draining(client):
+    client, state = client
+    state.ready = state.draining = True
+    for path in ("/run", "/run_sse"):
+        response = client.post(path, json={})
+        assert response.status_code == 503
+        assert response.json() == {"detail": "Server is shutting down"}
+    assert state.in_flight == 0
@@ -0,0 +1,56 @@
+import asyncio
+
+from google.adk.events import Event
+from google.genai import types
+
+from maestro_common.session_store import BoundedInMemorySessionService
+
+PLAN = "Warm up, then 5x5 squats. " * 100
+
+
+def _event(invocation_id: str, text: str) -> Event:
+    return Event(
+        invocation_id=invocation_id,
+        author="workout_agent",
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+    )
+
+
+async def _append(service, session_id: str, *events: Event):
+    session = await service.get_session(app_name="app", user_id="u", session_id=session_id)
+    if session is None:
+        session = await service.create_session(app_name="app", user_id="u", session_id=session_id)
+    for event in events:
+        await service.append_event(session, event)
+
+
+def test_shared_text_is_stored_once_until_its_last_event_is_deleted():
+    service = BoundedInMemorySessionService()
+
+    async def run():
+        await _append(service, "s1", _event("i1", PLAN))
+        await _append(service, "s2", _event("i2", "".join(PLAN)))
+        stored = [service.sessions["app"]["u"][sid].events[0].content.parts[0].text for sid in ("s1", "s2")]
+        assert stored[0] is stored[1]
+        assert service.stats["deduplicated_bytes"] == len(PLAN)
+
+        await service.delete_session(app_name="app", user_id="u", session_id="s1")
+        assert list(service._texts) == [PLAN]
+        await service.delete_session(app_name="app", user_id="u", session_id="s2")
+        assert not service._texts and not service._text_refs and not service._event_texts
+
+    asyncio.run(run())
+
+
+def test_compacted_and_evicted_events_release_their_texts():
+    service = BoundedInMemorySessionService(max_events=2, max_bytes=len(PLAN) + 1000)
+
+    async def run():
+        await _append(service, "s", _event("i1", PLAN), _event("i2", PLAN[::-1]))
+        # The first plan was compacted to make room for the second.
+        assert list(service._texts) == [PLAN[::-1]]
+        await _append(service, "s", _event("i3", "short"), _event("i4", "short"))
+        assert service.stats["evicted_events"] == 2
+        assert not service._texts and not service._text_refs
+
+    asyncio.run(run())
@@ -0,0 +1,53 @@
+from band_tour_agent.similarity import ArtistIndex, build_index
+
+EDGES = """artist,similar_artist,score
+The Strokes,Interpol,0.9
+The Strokes,The Libertines,0.7
+Arctic Monkeys,The Strokes,0.8
+Interpol,Editors,0.6
+Simon & Garfunkel,Paul Simon,0.95
+the strokes,The Strokes,1.0
+"""
+
+
+def _index(tmp_path, k=10) -> ArtistIndex:
+    edges = tmp_path / "edges.csv"
+    edges.write_text(EDGES, encoding="utf-8")
+    count = build_index(str(edges), str(tmp_path / "index"), k=k)
+    index = ArtistIndex(str(tmp_path / "index"))
+    assert len(index) == count
+    return index
+
+
+def test_lookup_ignores_case_punctuation_and_a_leading_the(tmp_path):
+    index = _index(tmp_path)
+    # "the strokes" → "The Strokes" is one artist, not a self-edge.
+    assert len(index) == 7
+    row = index.find("the strokes")
+    assert row is not None and index.name_at(row) == "The Strokes"
+    assert index.find("Strokes") == row
+    assert index.find("simon and garfunkel") == index.find("Simon & Garfunkel")
+
+
+def test_neighbours_are_symmetric_and_ordered_by_score(tmp_path):
+    index = _index(tmp_path)
+    assert index.similar("The Strokes") == [
+        {"name": "Interpol", "score": 0.9},
+        {"name": "Arctic Monkeys", "score": 0.8},
+        {"name": "The Libertines", "score": 0.7},
+    ]
+    # Edges only listed from the other side.
+    assert [a["name"] for a in index.similar("Editors")] == ["Interpol"]
+    assert [a["name"] for a in index.similar("Interpol")] == ["The Strokes", "Editors"]
+
+
+def test_k_is_respected(tmp_path):
+    assert [a["name"] for a in _index(tmp_path).similar("The Strokes", k=2)] == ["Interpol", "Arctic Monkeys"]
+    capped = _index(tmp_path, k=1)
+    assert capped.similar("The Strokes", k=5) == [{"name": "Interpol", "score": 0.9}]
+
+
+def test_unknown_artist(tmp_path):
+    index = _index(tmp_path)
+    assert index.find("Radiohead") is None
+    assert index.similar("Radiohead") is None
@@ -0,0 +1,56 @@
+import json
+
+from maestro_common.tool_budget import budgeted, paginate, truncate_output
+
+TITLES = [f"A Fairly Long Movie Title Number {i}" for i in range(100)]
+
+
+def test_page_is_fitted_to_the_budget_and_pages_on_without_gaps():
+    seen, offset = [], 0
+    while offset is not None:
+        page = paginate(TITLES, offset, limit=100, max_chars=500)
+        assert len(json.dumps(page)) <= 500
+        assert page["total"] == len(TITLES)
+        seen.extend(page["items"])
+        offset = page["next_offset"]
+    assert seen == TITLES
+
+
+def test_small_page_is_returned_whole():
+    page = paginate(TITLES, offset=95, limit=20)
+    assert page == {"items": TITLES[95:], "total": 100, "next_offset": None}
+    assert paginate(TITLES, offset=-5, limit=0)["items"] == TITLES[:1]
+
+
+def test_budgeted_page_keeps_its_structure():
+    @budgeted(500)
+    def get_watchlist(offset: int = 0, limit: int = 20):
+        return paginate(TITLES, offset, limit, max_chars=500)
+
+    page = get_watchlist(limit=100)
+    assert isinstance(page, dict) and page["next_offset"] == len(page["items"])
+
+
+def test_oversized_dict_reports_omissions_beside_the_data():
+    result = truncate_output({"recommendations": TITLES, "total": 100}, 300)
+    assert result["total"] == 100
+    kept = result["recommendations"]
+    assert kept == TITLES[:len(kept)]
+    assert result["omitted"] == {"recommendations": 100 - len(kept)}
+    assert "hint" not in result
+    assert len(json.dumps(result)) <= 300
+
+
+def test_oversized_list_keeps_items_typed():
+    result = truncate_output(TITLES, 300, hint="page on with `offset`")
+    assert result["items"] == TITLES[:len(result["items"])]
+    assert result["omitted"] == 100 - len(result["items"])
+    assert result["hint"] == "page on with `offset`"
+    assert len(json.dumps(result)) <= 300
+
+
+def test_text_is_cut_with_a_note():
+    result = truncate_output("x" * 1000, 100)
+    assert result.startswith("x" * 100) and result.endswith("[truncated 900 characters]")
+    hinted = truncate_output("x" * 1000, 100, hint="request one `section`")
+    assert hinted.endswith("[truncated 900 characters; request one `section`]")
@@ -0,0 +1,29 @@
+import asyncio
+import time
+import types
+
+from orchestrator_agent import agent, warmup
+
+
+class _HangingModels:
+    async def get(self, model):
+        await asyncio.sleep(60)
+
+
+def test_hanging_phases_do_not_block_startup(monkeypatch):
+    model = types.SimpleNamespace(
+        model="gemini", api_client=types.SimpleNamespace(aio=types.SimpleNamespace(models=_HangingModels()))
+    )
+    monkeypatch.setattr(warmup, "WARMUP_TIMEOUT", 0.2)
+    monkeypatch.setattr(warmup, "_models", lambda: [model])
+    # Synchronous work that overruns, like a slow runner build.
+    monkeypatch.setattr(agent, "get_runner", lambda app_name: time.sleep(0.3))
+
+    async def run():
+        start = time.perf_counter()
+        timings = await warmup.warm_up()
+        return timings, time.perf_counter() - start
+
+    timings, elapsed = asyncio.run(run())
+    assert timings["runners"] < 300 and timings["connections"] < 300
+    assert elapsed < 1.5
@@ -1,9 +1,11 @@
 from google.adk.agents import Agent
+from google.adk.models import Gemini
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 import asyncio
 from dotenv import load_dotenv
+from maestro_common.tool_budget import record_tool_usage
 from workout_agent.tools import save_workout, list_workouts, read_workout, get_movement_image
 
 load_dotenv()
@@ -12,9 +14,11 @@ APP_NAME = "workout_agent"
 USER_ID = "user1234"
 SESSION_ID = "1234"
 
+MODEL = Gemini(model="gemini-2.5-flash")
+
 root_agent = Agent(
     name="workout_agent",
-    model="gemini-2.5-flash",
+    model=MODEL,
     description="Agent to generate and manage workouts.",
     instruction="""
     You are a fitness assistant designed to help users generate and manage their workouts.
@@ -23,8 +27,8 @@ root_agent = Agent(
     1.  **Generating Workouts**: Create custom workout plans based on user preferences such as location (home/gym), duration, focus area, and equipment available.
     2.  **Visualizing Movements**: For EACH exercise in the workout, you MUST use the 'get_movement_image' tool to retrieve an illustration URL. Embed this image in the workout plan using Markdown syntax: `![Movement Name](image_url)`.
     3.  **Saving Workouts**: When a user is happy with a generated workout, save it to the file system using the 'save_workout' tool. The content passed to this tool MUST include the markdown images. You MUST ask for a name if one isn't provided.
-    4.  **Listing Workouts**: Retrieve a list of previously saved workouts using the 'list_workouts' tool.
-    5.  **Retrieving Workouts**: Read the details of a specific saved workout using the 'read_workout' tool.
+    4.  **Listing Workouts**: Retrieve a list of previously saved workouts using the 'list_workouts' tool. It returns one page at a time; pass 'offset' to get the next page only if needed.
+    5.  **Retrieving Workouts**: Read the details of a specific saved workout using the 'read_workout' tool. Use section="outline" to see its sections, or a section name (e.g. "Round 2") to read just that part. Image embeds are left out unless you pass include_images=True, which you should only do when showing the saved plan to the user.
 
     When generating a workout:
     -   Be specific with exercises, sets, and reps (or duration).
@@ -34,7 +38,8 @@ root_agent = Agent(
 
     Always check if the user wants to save the workout after generating it.
     """,
-    tools=[save_workout, list_workouts, read_workout, get_movement_image]
+    tools=[save_workout, list_workouts, read_workout, get_movement_image],
+    after_tool_callback=record_tool_usage,
 )
 
 # Session and Runner
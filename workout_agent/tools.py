@@ -1,7 +1,20 @@
 import os
-from typing import List
+import re
+from typing import Any, Dict, List, Tuple
+
+from maestro_common.tool_budget import budgeted, paginate
 
 WORKOUTS_DIR = "workouts"
+LIST_PAGE_CHARS = 2000
+
+# Markdown image embeds (`![Squat](https://...)`) and section headings, either
+# `## Heading` or a line that is entirely bold, e.g. `**Round 1**`.
+_IMAGE_PATTERN = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_HEADING_PATTERN = re.compile(r"^\s*(#{1,6}\s+.+|\*\*[^*]+\*\*:?)\s*$")
+
+# Saved workout names, keyed on the directory's mtime (which changes whenever
+# a workout is added or removed).
+_workout_names_cache = {"mtime": None, "names": []}
 
 def save_workout(workout_name: str, workout_plan: str) -> str:
     """Saves a generated workout plan to a file.
@@ -19,34 +32,66 @@ def save_workout(workout_name: str, workout_plan: str) -> str:
         filename = f"{safe_name}.md"
         filepath = os.path.join(WORKOUTS_DIR, filename)
         
-        with open(filepath, "w") as f:
+        # Write to a temp file and rename so other workers never read a partial plan.
+        tmp_path = f"{filepath}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
             f.write(workout_plan)
+        os.replace(tmp_path, filepath)
         return f"Workout '{workout_name}' saved successfully to {filename}."
     except Exception as e:
         return f"Error saving workout: {e}"
 
-def list_workouts() -> List[str]:
-    """Lists all saved workouts.
-
-    Returns:
-        A list of names of saved workouts.
-    """
+def _workout_names() -> List[str]:
     try:
         if not os.path.exists(WORKOUTS_DIR):
             return []
-        files = [f for f in os.listdir(WORKOUTS_DIR) if f.endswith(".md")]
-        return [f[:-3] for f in files] # Remove .md extension
+        mtime = os.stat(WORKOUTS_DIR).st_mtime_ns
+        if _workout_names_cache["mtime"] != mtime:
+            files = [f for f in os.listdir(WORKOUTS_DIR) if f.endswith(".md")]
+            _workout_names_cache["names"] = sorted(f[:-3] for f in files) # Remove .md extension
+            _workout_names_cache["mtime"] = mtime
+        return _workout_names_cache["names"]
     except Exception as e:
         return []
 
-def read_workout(workout_name: str) -> str:
+@budgeted(LIST_PAGE_CHARS, hint="page on with `offset`")
+def list_workouts(offset: int = 0, limit: int = 20) -> Dict[str, Any]:
+    """Lists one page of saved workouts.
+
+    Args:
+        offset: Index of the first workout to return.
+        limit: Maximum number of workout names to return (at most 100; a page is cut short if it would not fit the output budget).
+
+    Returns:
+        A dictionary with the page of workout names ('items'), the 'total' number of saved
+        workouts, and 'next_offset' to pass for the next page (None when there are no more).
+    """
+    return paginate(_workout_names(), offset, limit, max_chars=LIST_PAGE_CHARS)
+
+def _split_sections(plan: str) -> List[Tuple[str, List[str]]]:
+    """Splits a workout plan into (heading, lines) pairs; text before the first heading has an empty heading."""
+    sections = [("", [])]
+    for line in plan.splitlines():
+        if _HEADING_PATTERN.match(line):
+            sections.append((line.strip().strip("#*: ").strip(), [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(heading, lines) for heading, lines in sections if heading or any(l.strip() for l in lines)]
+
+@budgeted(hint='request one `section`, or section="outline" for the headings')
+def read_workout(workout_name: str, section: str = "", include_images: bool = False) -> str:
     """Reads a specific workout plan from a file.
 
     Args:
         workout_name: The name of the workout to retrieve.
+        section: Optional part of the plan to return. "outline" returns only the section headings;
+            any other value returns the first section whose heading contains it (e.g. "Round 2").
+            Leave empty for the whole plan.
+        include_images: Whether to keep the markdown image embeds. Only set this when showing
+            the plan to the user; image URLs are long and not needed to reason about the plan.
 
     Returns:
-        The content of the workout plan, or an error message if not found.
+        The content of the workout plan (or the requested section), or an error message if not found.
     """
     try:
         safe_name = "".join([c for c in workout_name if c.isalnum() or c in (' ', '-', '_')]).strip()
@@ -57,10 +102,24 @@ def read_workout(workout_name: str) -> str:
             return f"Workout '{workout_name}' not found."
         
         with open(filepath, "r") as f:
-            return f.read()
+            plan = f.read()
     except Exception as e:
         return f"Error reading workout: {e}"
 
+    if not include_images:
+        plan = _IMAGE_PATTERN.sub("", plan)
+    if not section:
+        return plan
+
+    sections = _split_sections(plan)
+    headings = [heading for heading, _ in sections if heading]
+    if section.strip().lower() == "outline":
+        return "\n".join(f"- {heading}" for heading in headings)
+    for heading, lines in sections:
+        if heading and section.strip().lower() in heading.lower():
+            return "\n".join(lines).strip()
+    return f"Section '{section}' not found in workout '{workout_name}'. Available sections: {', '.join(headings)}"
+
 def get_movement_image(movement_name: str) -> str:
     """Generates a placeholder image URL for a given movement.
 